@@ -1,17 +1,29 @@
 from datahugger.api import get
 from datahugger.api import info
+from datahugger.api import parse_many
 from datahugger.api import parse_resource_identifier
 from datahugger.base import DownloadResult
+from datahugger.batch import BatchResult
+from datahugger.batch import get_many
+from datahugger.batch import info_many
 from datahugger.exceptions import DOIError
 from datahugger.exceptions import RepositoryNotSupportedError
+from datahugger.files import FileList
+from datahugger.files import FileRecord
 
 __all__ = [
     "get",
     "info",
+    "get_many",
+    "info_many",
     "parse_resource_identifier",
+    "parse_many",
     "DownloadResult",
+    "BatchResult",
     "DOIError",
     "RepositoryNotSupportedError",
+    "FileList",
+    "FileRecord",
 ]
 
 try:
@@ -4,14 +4,41 @@ Example:
 
     python -m datahugger https://doi.org/10.5061/dryad.31zcrjdm5 $(mktemp -d)
 
+Pin the dataset in a manifest and download it from the manifest:
+
+    python -m datahugger 10.5061/dryad.31zcrjdm5 data --dry-run --manifest dryad.json
+    python -m datahugger dryad.json data
+
+Verify the checksums of a downloaded dataset:
+
+    python -m datahugger verify data https://doi.org/10.5061/dryad.31zcrjdm5
+
+Download the datasets of a file with an identifier per line (or - for stdin)
+and write the result of each dataset as a JSON line:
+
+    python -m datahugger batch dois.txt data --jobs 8 > results.jsonl
+
+Build or refresh the local index of re3data publishers:
+
+    python -m datahugger index
+
 """
 
 import argparse
+import json
 import logging
+import sys
+from pathlib import Path
 
 from datahugger import __version__
 from datahugger import get
+from datahugger import info
+from datahugger.base import SYNC_STATE_FILE
+from datahugger.batch import iter_many
 from datahugger.exceptions import DOIError
+from datahugger.re3data import build_re3data_index
+from datahugger.re3data import get_re3data_index_path
+from datahugger.verify import verify_checksums
 
 
 def print_red(s):
@@ -36,14 +63,223 @@ class KVAppendAction(argparse.Action):
         setattr(args, self.dest, d)
 
 
+def main_verify(argv):
+    parser = argparse.ArgumentParser(
+        prog="datahugger verify",
+        description="Verify the checksums of a downloaded dataset.",
+    )
+    parser.add_argument(
+        "output_dir",
+        help="The dir with the downloaded dataset.",
+    )
+    parser.add_argument(
+        "url_or_doi",
+        nargs="?",
+        default=None,
+        help="An URL or DOI to the dataset. Default: the listing stored "
+        "in the output dir by a download with --sync.",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        default=None,
+        type=int,
+        dest="max_workers",
+        help="Number of threads to hash with. Default: number of CPUs.",
+    )
+    parser.add_argument(
+        "--log-level",
+        default="WARNING",
+        help="Python based log levels. Default: WARNING.",
+    )
+
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=args.log_level)
+
+    if args.url_or_doi:
+        files_info = info(args.url_or_doi, progress=False).files
+    else:
+        try:
+            with open(Path(args.output_dir, SYNC_STATE_FILE)) as f:
+                files_info = json.load(f)["files"]
+        except (OSError, ValueError, KeyError):
+            parser.error(
+                f"No file listing found in '{args.output_dir}', "
+                "provide the URL or DOI of the dataset."
+            )
+
+    checksums = verify_checksums(
+        args.output_dir, files_info, max_workers=args.max_workers
+    )
+
+    for file, hash_match in sorted(checksums.items()):
+        if hash_match:
+            print(f"Checksum match: {hash_match} - {file}")
+        else:
+            print_red(f"Checksum match: {hash_match} - {file}")
+
+    n_failed = list(checksums.values()).count(False)
+    if n_failed:
+        print_red(f"{n_failed} of {len(checksums)} files failed verification.")
+        exit(1)
+
+    print_green(f"{len(checksums)} files successfully verified.")
+
+
+def main_index(argv):
+    parser = argparse.ArgumentParser(
+        prog="datahugger index",
+        description="Build or refresh the local index of re3data publishers, "
+        "used to find the service of DOIs of unknown repositories.",
+    )
+    parser.add_argument(
+        "--cache",
+        default=True,
+        help="The cache folder to store the index in. Default: user cache dir.",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        default=8,
+        type=int,
+        dest="max_workers",
+        help="Number of repositories to request concurrently. Default: 8.",
+    )
+    parser.add_argument(
+        "--log-level",
+        default="WARNING",
+        help="Python based log levels. Default: WARNING.",
+    )
+
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=args.log_level)
+
+    index = build_re3data_index(cache=args.cache, max_workers=args.max_workers)
+
+    print_green(
+        f"Indexed {len(index['publishers'])} publishers in "
+        f"{get_re3data_index_path(args.cache)}"
+    )
+
+
+def main_batch(argv):
+    parser = argparse.ArgumentParser(
+        prog="datahugger batch",
+        description="Download or list many datasets and write the result of "
+        "each dataset as a JSON line.",
+    )
+    parser.add_argument(
+        "input",
+        help="A file with an URL or DOI per line, or - to read from stdin.",
+    )
+    parser.add_argument(
+        "output_dir",
+        nargs="?",
+        default=None,
+        help="The dir to store the datasets to, in a subfolder per dataset.",
+    )
+    parser.add_argument(
+        "-d",
+        "--dry-run",
+        dest="print_only",
+        action="store_true",
+        help="Only resolve and list the datasets without downloading them.",
+    )
+    parser.add_argument(
+        "--max-file-size",
+        default=None,
+        type=int,
+        help="Skip files larger than this size. Might not work for all services.",
+    )
+    parser.add_argument(
+        "--include",
+        action="append",
+        dest="include",
+        help="Only download files matching this glob pattern. "
+        "May appear multiple times.",
+    )
+    parser.add_argument(
+        "--sync",
+        dest="sync",
+        action="store_true",
+        help="Only download files that are missing or changed.",
+    )
+    parser.add_argument(
+        "--cache",
+        nargs="?",
+        const=True,
+        default=False,
+        help="Cache the responses of metadata requests on disk, in the user "
+        "cache dir or the given folder.",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        default=4,
+        type=int,
+        dest="max_workers",
+        help="Number of requests of all datasets together. Default: 4.",
+    )
+    parser.add_argument(
+        "--log-level",
+        default="WARNING",
+        help="Python based log levels. Default: WARNING.",
+    )
+
+    args = parser.parse_args(argv)
+
+    if args.output_dir is None and not args.print_only:
+        parser.error("the output_dir is required, unless --dry-run is given")
+
+    logging.basicConfig(level=args.log_level)
+
+    if args.input == "-":
+        lines = sys.stdin.read().splitlines()
+    else:
+        with open(args.input) as f:
+            lines = f.read().splitlines()
+
+    resources = [line.strip() for line in lines if line.strip()]
+
+    results = iter_many(
+        resources,
+        None if args.print_only else args.output_dir,
+        max_file_size=args.max_file_size,
+        include=args.include,
+        sync=args.sync,
+        progress=False,
+        max_workers=args.max_workers,
+        cache=args.cache,
+    )
+
+    n_failed = 0
+    for result in results:
+        n_failed += not result.ok
+        print(json.dumps(result.to_dict()), flush=True)
+
+    if n_failed:
+        exit(1)
+
+
 def main():
+    if sys.argv[1:2] == ["verify"]:
+        return main_verify(sys.argv[2:])
+
+    if sys.argv[1:2] == ["batch"]:
+        return main_batch(sys.argv[2:])
+
+    if sys.argv[1:2] == ["index"]:
+        return main_index(sys.argv[2:])
+
     parser = argparse.ArgumentParser(
         prog="datahugger",
         description="One downloader for all scientific data.",
     )
     parser.add_argument(
         "url_or_doi",
-        help="An URL or DOI to scientific data repository.",
+        help="An URL or DOI to scientific data repository, or a manifest file.",
     )
 
     parser.add_argument(
@@ -66,8 +302,53 @@ def main():
     parser.add_argument("--no-unzip", dest="unzip", action="store_false")
     parser.set_defaults(unzip=True)
 
+    parser.add_argument(
+        "--remote-unzip",
+        dest="remote_unzip",
+        action="store_true",
+        help="Only fetch the included members of a single zip file.",
+    )
+
+    parser.add_argument(
+        "--include",
+        action="append",
+        dest="include",
+        help="Only download files matching this glob pattern. "
+        "May appear multiple times.",
+    )
+
     parser.add_argument("--checksum", dest="checksum", action="store_true")
 
+    parser.add_argument(
+        "--manifest",
+        default=None,
+        help="Write the service and file listing of the dataset to this "
+        "manifest file (.json).",
+    )
+
+    parser.add_argument(
+        "--cache",
+        nargs="?",
+        const=True,
+        default=False,
+        help="Cache the responses of metadata requests on disk, in the user "
+        "cache dir or the given folder.",
+    )
+
+    parser.add_argument(
+        "--checkpoint",
+        default=None,
+        help="Checkpoint the crawl of the listing to this file and resume "
+        "an interrupted crawl from it.",
+    )
+
+    parser.add_argument(
+        "--sync",
+        dest="sync",
+        action="store_true",
+        help="Only download files that are missing or changed.",
+    )
+
     parser.add_argument("--no-progress", dest="progress", action="store_false")
     parser.set_defaults(progress=True)
 
@@ -79,6 +360,22 @@ def main():
         help="Only print the files to download without downloading them.",
     )
 
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        default=1,
+        type=int,
+        dest="max_workers",
+        help="Number of files to download concurrently. Default: 1.",
+    )
+
+    parser.add_argument(
+        "--segments",
+        default=1,
+        type=int,
+        help="Download large files in this number of parallel byte ranges. Default: 1.",
+    )
+
     parser.add_argument(
         "--log-level",
         default="WARNING",
@@ -119,6 +416,14 @@ def main():
             progress=args.progress,
             print_only=args.print_only,
             params=args.params,
+            max_workers=args.max_workers,
+            segments=args.segments,
+            sync=args.sync,
+            remote_unzip=args.remote_unzip,
+            include=args.include,
+            checkpoint=args.checkpoint,
+            manifest=args.manifest,
+            cache=args.cache,
         )
 
     except DOIError as doi_err:
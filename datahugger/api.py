@@ -1,14 +1,20 @@
 from datahugger.handles import DOI
 from datahugger.handles import ArXiv
 from datahugger.handles import Handle
-from datahugger.handles import is_arxiv
-from datahugger.handles import is_doi
-from datahugger.handles import is_handle
+from datahugger.handles import parse_identifier
+from datahugger.manifest import is_manifest
+from datahugger.manifest import read_manifest
+from datahugger.manifest import write_manifest
+from datahugger.resolve_cache import CACHED_ERRORS
+from datahugger.resolve_cache import ResolveCache
+from datahugger.resolvers import _get_service_class
 from datahugger.resolvers import _resolve_service
-from datahugger.utils import _is_url
+from datahugger.resolvers import _route_doi
+from datahugger.session import create_session
+from datahugger.utils import _get_url
 
 
-def parse_resource_identifier(resource, resolve=True):
+def parse_resource_identifier(resource, resolve=True, session=None):
     """Parse resource identifier or location.
 
     Arguments
@@ -17,6 +23,8 @@ def parse_resource_identifier(resource, resolve=True):
         The URL, DOI, or Handle of the dataset.
     resolve: bool
         Resolve handles (e.g. DOIs and Handles). Default: True.
+    session: requests.Session
+        The session to resolve handles with. Default: shared session.
 
     Returns
     -------
@@ -26,30 +34,105 @@ def parse_resource_identifier(resource, resolve=True):
     """
 
     if isinstance(resource, (DOI, Handle, ArXiv)):
-        handle = resource
-    elif isinstance(resource, str) and is_doi(resource):
-        handle = DOI.parse(resource)
-
-        if resolve:
-            handle.resolve()
-    elif isinstance(resource, str) and is_handle(resource):
-        handle = Handle.parse(resource)
-
-        if resolve:
-            handle.resolve()
-    elif isinstance(resource, str) and is_arxiv(resource):
-        handle = ArXiv.parse(resource)
-    elif isinstance(resource, str) and _is_url(resource):
-        handle = resource
-    else:
+        return resource
+
+    if not isinstance(resource, str):
         raise ValueError(
             f"'{resource}' is not a correct resource "
             "identifier (e.g. a URL, DOI, Handle)"
         )
 
+    handle = parse_identifier(resource)
+
+    if isinstance(handle, DOI):
+        # skip the resolution of DOIs of known services
+        route = _route_doi(handle)
+        if route is not None:
+            handle._resolved_url = route[1]
+        elif resolve:
+            handle.resolve(session=session)
+    elif isinstance(handle, Handle) and resolve:
+        handle.resolve(session=session)
+
     return handle
 
 
+def parse_many(resources, resolve=False, session=None):
+    """Parse many resource identifiers or locations.
+
+    Each identifier is classified with a single precompiled expression,
+    which makes it suitable for millions of identifiers (e.g. a dump of
+    DataCite).
+
+    Arguments
+    ---------
+    resources: iterable
+        The URLs, DOIs, or Handles to parse.
+    resolve: bool
+        Resolve handles (e.g. DOIs and Handles). DOIs of known services
+        are never resolved. Default: False.
+    session: requests.Session
+        The session to resolve handles with. Default: shared session.
+
+    Returns
+    -------
+
+    list:
+        The parsed resource handle of each identifier (see
+        `parse_resource_identifier`), or the ValueError of identifiers
+        that are not valid.
+    """
+
+    handles = []
+    for resource in resources:
+        try:
+            handles.append(
+                parse_resource_identifier(resource, resolve=resolve, session=session)
+            )
+        except ValueError as err:
+            handles.append(err)
+
+    return handles
+
+
+def _resolve(resource, session=None, cache=False):
+    """Resolve the resource identifier and its service.
+
+    With cache, the resolution (or the error) is read from and stored in
+    the on-disk resolve cache.
+    """
+
+    if not cache:
+        handle = parse_resource_identifier(resource, session=session)
+        return handle, _resolve_service(handle, session=session)
+
+    resolve_cache = ResolveCache(cache)
+
+    # raises the error of a cached failed resolution
+    cached = resolve_cache.get(resource)
+    if cached is not None:
+        url, service = cached
+        service_class = _get_service_class(service)
+
+        if service_class is not None:
+            handle = parse_resource_identifier(resource, resolve=False)
+            if isinstance(handle, (DOI, Handle)):
+                handle._resolved_url = url
+
+            return handle, service_class
+
+    try:
+        handle = parse_resource_identifier(resource, session=session)
+        service_class = _resolve_service(handle, session=session, cache=cache)
+    except tuple(CACHED_ERRORS.values()) as err:
+        resolve_cache.set(resource, error=err)
+        raise
+
+    resolve_cache.set(resource, url=_get_url(handle), service=service_class.__name__)
+
+    return handle, service_class
+
+
 def info(
     resource,
     max_file_size=None,
@@ -59,13 +142,22 @@ def info(
     progress=True,
     print_only=False,
     params=None,
+    max_workers=1,
+    segments=1,
+    sync=False,
+    remote_unzip=False,
+    include=None,
+    checkpoint=None,
+    manifest=None,
+    cache=False,
+    session=None,
 ):
     """Get info on the content of the dataset.
 
     Arguments
     ---------
     resource: str, pathlib.Path
-        The URL, DOI, or Handle of the dataset.
+        The URL, DOI, or Handle of the dataset, or a manifest file.
     max_file_size: int
         The maximum number of bytes for a single file. If exceeded,
         the file is skipped.
@@ -82,7 +174,42 @@ def info(
         Print the output of the dataset download without downloading
         the actual files (Dry run). Default: False.
     params: dict
-        Extra parameters for the request.
+        Extra parameters for the request. The transfer policy of the
+        service can be overridden with the params max_connections,
+        api_rate, file_rate (requests per minute), chunk_size and segments.
+    max_workers: int
+        The maximum number of files to download concurrently. Default: 1.
+    segments: int
+        Download large files in this number of parallel byte ranges if the
+        server supports range requests. Default: 1 (no segments, unless
+        the service prefers segments).
+    sync: bool
+        Download files that are missing or differ in size or hash from the
+        listing, skip the files that are up to date. Default: False.
+    remote_unzip: bool
+        If the dataset is a single zip file, list its members as the files
+        of the dataset and only fetch the members to download with range
+        requests. Default: False.
+    include: list
+        Only download the files (or zip members) that match one of these
+        glob patterns, e.g. ["README*", "*.csv"]. Default: all files.
+    checkpoint: str, pathlib.Path
+        File to checkpoint the crawl of the listing to. An interrupted
+        crawl resumes from this file, which is removed once the listing
+        is complete. Default: None.
+    manifest: str, pathlib.Path
+        Write the service and file listing of the dataset to this
+        manifest file (.json). Pass the manifest as resource to download
+        the dataset without resolving the identifier or listing the
+        files. Default: None.
+    cache: bool, str, pathlib.Path
+        Cache the resolved identifier and service, and the responses of
+        metadata requests (not the files) on disk, in the user cache dir
+        (True) or the given folder. The responses are only cached if no
+        session is given. Default: False.
+    session: requests.Session
+        The session used for all requests. Default: a new session with a
+        connection pool sized for max_workers and segments.
 
     Returns
     -------
@@ -91,11 +218,10 @@ def info(
         The dataset download object for the specific service.
     """
 
-    handle = parse_resource_identifier(resource)
-    service_class = _resolve_service(handle)
+    if session is None:
+        session = create_session(max_workers * segments, cache=cache)
 
-    return service_class(
-        handle,
+    options = dict(
         max_file_size=max_file_size,
         force_download=force_download,
         unzip=unzip,
@@ -103,8 +229,26 @@ def info(
         progress=progress,
         print_only=print_only,
         params=params,
+        max_workers=max_workers,
+        segments=segments,
+        sync=sync,
+        remote_unzip=remote_unzip,
+        include=include,
+        checkpoint=checkpoint,
+        session=session,
     )
 
+    if is_manifest(resource):
+        service = read_manifest(resource, **options)
+    else:
+        handle, service_class = _resolve(resource, session=session, cache=cache)
+        service = service_class(handle, **options)
+
+    if manifest:
+        write_manifest(service, manifest)
+
+    return service
+
 
 def get(
     resource,
@@ -116,6 +260,15 @@ def get(
     progress=True,
     print_only=False,
     params=None,
+    max_workers=1,
+    segments=1,
+    sync=False,
+    remote_unzip=False,
+    include=None,
+    checkpoint=None,
+    manifest=None,
+    cache=False,
+    session=None,
 ):
     """Get the content of repository.
 
@@ -125,7 +278,7 @@ def get(
     Arguments
     ---------
     resource: str, pathlib.Path
-        The URL, DOI, or Handle of the dataset.
+        The URL, DOI, or Handle of the dataset, or a manifest file.
     output_folder: str, pathlib.Path
         The folder to download the dataset files to.
     max_file_size: int
@@ -144,7 +297,42 @@ def get(
         Print the output of the dataset download without downloading
         the actual files (Dry run). Default: False.
     params: dict
-        Extra parameters for the request.
+        Extra parameters for the request. The transfer policy of the
+        service can be overridden with the params max_connections,
+        api_rate, file_rate (requests per minute), chunk_size and segments.
+    max_workers: int
+        The maximum number of files to download concurrently. Default: 1.
+    segments: int
+        Download large files in this number of parallel byte ranges if the
+        server supports range requests. Default: 1 (no segments, unless
+        the service prefers segments).
+    sync: bool
+        Download files that are missing or differ in size or hash from the
+        listing, skip the files that are up to date. Default: False.
+    remote_unzip: bool
+        If the dataset is a single zip file, list its members as the files
+        of the dataset and only fetch the members to download with range
+        requests. Default: False.
+    include: list
+        Only download the files (or zip members) that match one of these
+        glob patterns, e.g. ["README*", "*.csv"]. Default: all files.
+    checkpoint: str, pathlib.Path
+        File to checkpoint the crawl of the listing to. An interrupted
+        crawl resumes from this file, which is removed once the listing
+        is complete. Default: None.
+    manifest: str, pathlib.Path
+        Write the service and file listing of the dataset to this
+        manifest file (.json). Pass the manifest as resource to download
+        the dataset without resolving the identifier or listing the
+        files. Default: None.
+    cache: bool, str, pathlib.Path
+        Cache the resolved identifier and service, and the responses of
+        metadata requests (not the files) on disk, in the user cache dir
+        (True) or the given folder. The responses are only cached if no
+        session is given. Default: False.
+    session: requests.Session
+        The session used for all requests. Default: a new session with a
+        connection pool sized for max_workers and segments.
 
     Returns
     -------
@@ -162,6 +350,15 @@ def get(
         progress=progress,
         print_only=print_only,
         params=params,
+        max_workers=max_workers,
+        segments=segments,
+        sync=sync,
+        remote_unzip=remote_unzip,
+        include=include,
+        checkpoint=checkpoint,
+        manifest=manifest,
+        cache=cache,
+        session=session,
     )
 
     return service.download(output_folder)
@@ -1,23 +1,110 @@
 import hashlib
-import io
+import itertools
 import json
 import logging
 import os
 import re
+import tempfile
 import time
 import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import as_completed
+from contextlib import contextmanager
+from fnmatch import fnmatch
+from functools import lru_cache
 from pathlib import Path
 from typing import Union
 from urllib.parse import urlparse
 
-import requests
 from jsonpath_ng.ext import parse
 from scitree import scitree
 from tqdm import tqdm
 
+from datahugger.checkpoint import CrawlCheckpoint
+from datahugger.files import FileList
+from datahugger.files import FileRecord
+from datahugger.policy import TransferPolicy
+from datahugger.policy import get_host_limiter
+from datahugger.remotezip import open_remote_file
+from datahugger.retry import RETRY_ERRORS
+from datahugger.retry import RETRY_STATUS
+from datahugger.retry import RetryStats
+from datahugger.retry import get_retrier
+from datahugger.session import create_session
 from datahugger.utils import _format_filename
 from datahugger.utils import _get_url
+from datahugger.utils import _hash_file
+from datahugger.utils import _is_hash_type
 from datahugger.utils import _is_url
+from datahugger.verify import verify_checksums
+
+# minimal number of bytes per segment for segmented downloads
+SEGMENT_MIN_SIZE = 8 * 1024 * 1024
+
+# file in the output folder with the fingerprints of the synced files
+SYNC_STATE_FILE = ".datahugger.json"
+
+# plain dotted paths like 'attributes.size' that don't need a JSONPath parser
+DOTTED_PATH_REGEXP = re.compile(r"^[\w\-:]+(\.[\w\-:]+)*$")
+
+
+class _DottedPath:
+    """Fast alternative to JSONPath for plain dotted paths."""
+
+    def __init__(self, path):
+        self.keys = path.split(".")
+
+    def all(self, record):
+        try:
+            for key in self.keys:
+                record = record[key]
+            return [record]
+        except (KeyError, TypeError, IndexError):
+            return []
+
+    def first(self, record):
+        values = self.all(record)
+        return values[0] if values else None
+
+
+class _JSONPath:
+    """Compiled JSONPath expression."""
+
+    def __init__(self, expression):
+        self.expression = (
+            parse(expression) if isinstance(expression, str) else expression
+        )
+
+    def first(self, record):
+        try:
+            return self.expression.find(record)[0].value
+        except Exception:
+            return None
+
+    def all(self, record):
+        return [x.value for x in self.expression.find(record)]
+
+
+@lru_cache(maxsize=None)
+def _compile_jsonpath(jsonp):
+    """Compile a JSONPath expression once.
+
+    Arguments
+    ---------
+    jsonp: str, jsonpath_ng.JSONPath
+        The JSONPath expression or a parsed expression.
+
+    Returns
+    -------
+    object:
+        Object with the methods first(record) and all(record) to find the
+        first value or all values matching the expression.
+    """
+
+    if isinstance(jsonp, str) and DOTTED_PATH_REGEXP.match(jsonp):
+        return _DottedPath(jsonp)
+
+    return _JSONPath(jsonp)
 
 
 class DownloadResult:
@@ -28,7 +115,20 @@ class DownloadResult:
         self.output_folder = output_folder
 
     def __str__(self):
-        return f"<{self.__class__.__name__} n_files={len(self)} >"
+        return (
+            f"<{self.__class__.__name__} n_files={len(self)} "
+            f"n_retries={self.n_retries} n_failed={self.n_failed} >"
+        )
+
+    @property
+    def n_retries(self):
+        """The number of retried requests of the dataset."""
+        return self.dataset.retry_stats.retries
+
+    @property
+    def n_failed(self):
+        """The number of requests of the dataset that failed after retries."""
+        return self.dataset.retry_stats.failures
 
     def __len__(self):
         return len(self.dataset.files)
@@ -47,6 +147,9 @@ class DatasetDownloader:
 
     API_URL = None
 
+    # limits of the service, overridable with params (e.g. chunk_size)
+    TRANSFER_POLICY = TransferPolicy()
+
     def __init__(
         self,
         resource,
@@ -57,6 +160,13 @@ class DatasetDownloader:
         checksum=False,
         print_only=False,
         params=None,
+        max_workers=1,
+        segments=1,
+        sync=False,
+        remote_unzip=False,
+        include=None,
+        checkpoint=None,
+        session=None,
     ):
         super().__init__()
         self.resource = resource
@@ -67,11 +177,47 @@ class DatasetDownloader:
         self.checksum = checksum
         self.print_only = print_only
         self.params = params
+        self.max_workers = max_workers
+        self.segments = segments
+        self.sync = sync
+        self.remote_unzip = remote_unzip
+        self.include = include
+        self.checkpoint = checkpoint
+
+        # segments > 1 and params take precedence over the service policy
+        self.policy = self.TRANSFER_POLICY.replace(
+            segments=segments if segments > 1 else None
+        ).override(params)
+
+        # checksum results and local file fingerprints of this run
+        self._checksums = {}
+        self._fingerprints = {}
+
+        # zip archive read with range requests (remote_unzip)
+        self._remote_zip = None
+
+        # crawled pages of the listing (checkpoint)
+        self._crawl_checkpoint = None
+
+        # the files property of a subclass is being read (see iter_files)
+        self._reading_custom_files = False
+
+        # shared executor of a batch of datasets (get_many)
+        self._executor = None
+        self.session = (
+            session
+            if session is not None
+            else create_session(max_workers * self.policy.segments)
+        )
+
+        # retries of the requests of the dataset, with the budget and the
+        # circuit breakers of the session (run)
+        self.retrier = get_retrier(self.session)
+        self.retry_stats = RetryStats()
 
     def _get_attr_attr(self, record, jsonp):
         try:
-            jsonpath_expression = parse(jsonp)
-            return jsonpath_expression.find(record)[0].value
+            return _compile_jsonpath(jsonp).first(record)
         except Exception:
             return None
 
@@ -159,34 +305,412 @@ class DatasetDownloader:
             return
 
         if not self.print_only:
-            logging.info(f"Downloading file {file_link}")
-            res = requests.get(file_link, stream=True)
-            res.raise_for_status()
-
             output_fp = Path(output_folder, file_name)
-            Path(output_fp).parent.mkdir(parents=True, exist_ok=True)
 
             if not self.force_download and output_fp.exists():
-                print("File already exists:", file_name)
+                if not self.sync or self._is_file_current(
+                    output_fp, file_name, file_size, file_hash, file_hash_type
+                ):
+                    print("File already exists:", file_name)
+                    return
+
+                logging.info(f"File {file_name} changed, download again")
+
+            if self.policy.segments > 1 and self._download_file_segmented(
+                file_link,
+                output_fp,
+                file_name,
+                file_size=file_size,
+                file_hash=file_hash,
+                file_hash_type=file_hash_type,
+            ):
                 return
 
-            if self.progress:
-                with tqdm.wrapattr(
-                    open(output_fp, "wb"),
-                    "write",
-                    miniters=1,
-                    desc=_format_filename(file_name),
-                    total=int(res.headers.get("content-length", 0)),
-                    bar_format="{l_bar}{bar}| {n_fmt}/{total_fmt}",
-                ) as fout:
-                    for chunk in res.iter_content(chunk_size=4096):
-                        fout.write(chunk)
-            else:
-                with open(output_fp, "wb") as f:
-                    f.write(res.content)
+            # retry failed and interrupted transfers, resumed from the
+            # partial download
+            with self._limit(file_link, "file"):
+                self.retrier.call(
+                    lambda: self._download_file_stream(
+                        file_link,
+                        output_fp,
+                        file_name,
+                        file_hash=file_hash,
+                        file_hash_type=file_hash_type,
+                    ),
+                    file_link,
+                    stats=self.retry_stats,
+                )
         else:
             print(f"{_format_filename(file_name)}: COMPLETE")
 
+    def _is_file_current(
+        self, output_fp, file_name, file_size=None, file_hash=None, file_hash_type=None
+    ):
+        """Check if a local file matches the size and hash of the listing.
+
+        The hash of the local file is cached in the fingerprints of the
+        sync state and only computed again if the size or modification
+        time of the file changed.
+        """
+
+        stat = output_fp.stat()
+
+        try:
+            if file_size is not None and stat.st_size != int(file_size):
+                return False
+        except ValueError:
+            pass
+
+        # compare the size only if the hash type isn't supported (e.g. DSpace)
+        if file_hash is None or not _is_hash_type(file_hash_type):
+            return True
+
+        fingerprint = self._fingerprints.get(file_name, {})
+
+        if (
+            fingerprint.get("size") == stat.st_size
+            and fingerprint.get("mtime_ns") == stat.st_mtime_ns
+            and fingerprint.get("hash_type") == file_hash_type
+            and fingerprint.get("hash")
+        ):
+            local_hash = fingerprint["hash"]
+        else:
+            local_hash = _hash_file(output_fp, file_hash_type)
+            self._fingerprints[file_name] = {
+                "size": stat.st_size,
+                "mtime_ns": stat.st_mtime_ns,
+                "hash_type": file_hash_type,
+                "hash": local_hash,
+            }
+
+        return local_hash == str(file_hash).lower()
+
+    def _download_file_stream(
+        self, file_link, output_fp, file_name, file_hash=None, file_hash_type=None
+    ):
+        """Download a single file in a single (resumable) stream.
+
+        The file is written to a '.part' file that is renamed on completion.
+        The validators of the response (ETag, Last-Modified and size) are
+        stored next to it, such that an interrupted download can continue
+        with a range request instead of starting from scratch. The hash of
+        the file is computed on the chunks while they are written.
+        """
+
+        part_fp = output_fp.with_name(output_fp.name + ".part")
+        part_info_fp = output_fp.with_name(output_fp.name + ".part.json")
+
+        headers = {}
+        part_info = None
+        if not self.force_download and part_fp.exists() and part_info_fp.exists():
+            try:
+                with open(part_info_fp) as f:
+                    part_info = json.load(f)
+                offset = part_fp.stat().st_size
+                resumable = part_info["link"] == file_link and offset > 0
+            except (OSError, ValueError, KeyError, TypeError):
+                # e.g. written partially by an interrupted run, start over
+                logging.info(f"Partial download of {file_link} can't be resumed")
+                resumable = False
+
+            if resumable:
+                logging.info(f"Resume download of {file_link} from byte {offset}")
+                headers["Range"] = f"bytes={offset}-"
+                etag = part_info.get("etag")
+                if etag and not etag.startswith("W/"):
+                    headers["If-Range"] = etag
+                elif part_info.get("last_modified"):
+                    headers["If-Range"] = part_info["last_modified"]
+            else:
+                part_info = None
+                part_fp.unlink(missing_ok=True)
+                part_info_fp.unlink(missing_ok=True)
+
+        logging.info(f"Downloading file {file_link}")
+        # retried by the caller, such that a retry resumes the download
+        res = self._request("GET", file_link, stream=True, headers=headers, retry=False)
+
+        offset = 0
+        if res.status_code == 206:
+            # validate the continuation against the partial download
+            content_range = res.headers.get("content-range", "")
+            match = re.match(r"bytes (\d+)-\d+/(\d+|\*)", content_range)
+            if (
+                part_info is not None
+                and match
+                and int(match.group(1)) == part_fp.stat().st_size
+                and match.group(2) == str(part_info.get("size"))
+            ):
+                offset = int(match.group(1))
+            else:
+                logging.info(f"Partial download of {file_link} is outdated")
+                res.close()
+                res = self._request("GET", file_link, stream=True, retry=False)
+        elif headers and res.status_code == 416:
+            # range not satisfiable, start over
+            res.close()
+            res = self._request("GET", file_link, stream=True, retry=False)
+
+        res.raise_for_status()
+
+        total = None
+        if "content-length" in res.headers and "content-encoding" not in res.headers:
+            total = offset + int(res.headers["content-length"])
+
+        output_fp.parent.mkdir(parents=True, exist_ok=True)
+
+        if offset == 0:
+            # store the validators to be able to resume the download, the
+            # file is replaced at once such that it's never incomplete
+            with open(f"{part_info_fp}.tmp", "w") as f:
+                json.dump(
+                    {
+                        "link": file_link,
+                        "etag": res.headers.get("etag"),
+                        "last_modified": res.headers.get("last-modified"),
+                        "size": total,
+                    },
+                    f,
+                )
+            os.replace(f"{part_info_fp}.tmp", part_info_fp)
+
+        h = None
+        if (
+            (self.checksum or self.sync)
+            and file_hash is not None
+            and _is_hash_type(file_hash_type)
+        ):
+            h = hashlib.new(file_hash_type)
+
+            # hash the partial download before continuing
+            if offset:
+                with open(part_fp, "rb") as f:
+                    for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                        h.update(chunk)
+
+        with open(part_fp, "ab" if offset else "wb") as f, tqdm(
+            total=total,
+            initial=offset,
+            desc=_format_filename(file_name),
+            unit="B",
+            unit_scale=True,
+            miniters=1,
+            bar_format="{l_bar}{bar}| {n_fmt}/{total_fmt}",
+            disable=not self.progress,
+        ) as pbar:
+            for chunk in res.iter_content(chunk_size=self.policy.chunk_size):
+                f.write(chunk)
+                if h is not None:
+                    h.update(chunk)
+                pbar.update(len(chunk))
+
+        if total is not None and part_fp.stat().st_size != total:
+            raise OSError(f"Incomplete download of {file_name}, retry to resume")
+
+        os.replace(part_fp, output_fp)
+        part_info_fp.unlink()
+
+        if h is not None:
+            local_hash = h.hexdigest()
+            self._report_checksum(file_name, local_hash == str(file_hash).lower())
+
+            stat = output_fp.stat()
+            self._fingerprints[file_name] = {
+                "size": stat.st_size,
+                "mtime_ns": stat.st_mtime_ns,
+                "hash_type": file_hash_type,
+                "hash": local_hash,
+            }
+
+    def _download_file_segmented(
+        self,
+        file_link,
+        output_fp,
+        file_name,
+        file_size=None,
+        file_hash=None,
+        file_hash_type=None,
+    ):
+        """Download a single file in parallel byte ranges.
+
+        The file is split in (at most) `segments` byte ranges that are
+        downloaded concurrently into a preallocated file.
+
+        Returns
+        -------
+        bool:
+            False if the server doesn't support range requests or the file
+            is too small to split, True if the file is downloaded.
+        """
+
+        res = self._request("HEAD", file_link, "file", allow_redirects=True)
+        if (
+            not res.ok
+            or res.headers.get("accept-ranges", "").lower() != "bytes"
+            or "content-encoding" in res.headers
+            or "content-length" not in res.headers
+        ):
+            logging.info(f"No support for range requests {file_link}")
+            return False
+
+        size = int(res.headers["content-length"])
+        n_segments = min(self.policy.segments, size // SEGMENT_MIN_SIZE)
+        if n_segments < 2:
+            return False
+
+        # download from the redirected location, e.g. the storage backend
+        url = res.url
+
+        logging.info(f"Downloading file {file_link} in {n_segments} segments")
+        output_fp.parent.mkdir(parents=True, exist_ok=True)
+
+        # a preallocated file can't be resumed as a single stream
+        part_fp = output_fp.with_name(output_fp.name + ".part")
+        output_fp.with_name(output_fp.name + ".part.json").unlink(missing_ok=True)
+        with open(part_fp, "wb") as f:
+            f.truncate(size)
+
+        pbar = tqdm(
+            total=size,
+            desc=_format_filename(file_name),
+            unit="B",
+            unit_scale=True,
+            bar_format="{l_bar}{bar}| {n_fmt}/{total_fmt}",
+            disable=not self.progress,
+        )
+
+        # the position to continue each segment (by its first byte) from
+        position = {}
+
+        def _download_range(segment, end):
+            start = position[segment]
+            headers = {"Range": f"bytes={start}-{end}"}
+            with self._limit(url, "file"), self._request(
+                "GET", url, headers=headers, stream=True, retry=False
+            ) as r:
+                r.raise_for_status()
+                if r.status_code != 206:
+                    raise OSError(f"Range request not honoured for {file_link}")
+
+                with open(part_fp, "r+b") as f:
+                    f.seek(start)
+                    try:
+                        for chunk in r.iter_content(chunk_size=self.policy.chunk_size):
+                            f.write(chunk)
+                            pbar.update(len(chunk))
+                    finally:
+                        position[segment] = f.tell()
+
+                    if f.tell() != end + 1:
+                        raise OSError(f"Incomplete range {start}-{end} of {file_link}")
+
+        def _download_segment(start, end):
+            # retry failed and interrupted segments, from the last position
+            position[start] = start
+            self.retrier.call(
+                lambda: _download_range(start, end),
+                url,
+                stats=self.retry_stats,
+            )
+
+        bounds = [
+            (i * size // n_segments, (i + 1) * size // n_segments - 1)
+            for i in range(n_segments)
+        ]
+        with pbar, ThreadPoolExecutor(max_workers=n_segments) as executor:
+            list(executor.map(lambda b: _download_segment(*b), bounds))
+
+        if part_fp.stat().st_size != size:
+            raise OSError(f"Size of {file_name} doesn't match {size} bytes")
+
+        os.replace(part_fp, output_fp)
+
+        if file_hash is not None and _is_hash_type(file_hash_type):
+            local_hash = _hash_file(output_fp, file_hash_type)
+            self._report_checksum(file_name, local_hash == str(file_hash).lower())
+
+        return True
+
+    @contextmanager
+    def _limit(self, url, endpoint="api"):
+        """Limit a request to the host of the url with the transfer policy.
+
+        Arguments
+        ---------
+        url: str
+            The URL of the request.
+        endpoint: str
+            The kind of endpoint, 'api' (listing and metadata) or 'file'.
+        """
+
+        limiter = get_host_limiter(urlparse(url).netloc, self.policy)
+
+        with limiter.limit(endpoint):
+            yield
+
+    def _request(self, method, url, endpoint=None, retry=True, **kwargs):
+        """Do a request of the dataset and retry it if it fails.
+
+        The latency and failures of the attempts are recorded for the
+        adaptive concurrency of the host (see TransferPolicy.adaptive).
+
+        Arguments
+        ---------
+        method: str
+            The HTTP method.
+        url: str
+            The URL of the request.
+        endpoint: str
+            Limit each attempt with the transfer policy of the endpoint,
+            'api' or 'file'. Default: None (limited by the caller).
+        retry: bool
+            Retry the request if it fails. Disable it if the caller
+            retries, e.g. to resume a download.
+        kwargs:
+            The arguments of the request.
+        """
+
+        limiter = get_host_limiter(urlparse(url).netloc, self.policy)
+
+        def send():
+            start = time.monotonic()
+            try:
+                res = self.session.request(method, url, **kwargs)
+            except RETRY_ERRORS:
+                limiter.record_failure()
+                raise
+
+            if res.status_code in RETRY_STATUS:
+                limiter.record_failure()
+            else:
+                limiter.record_success(time.monotonic() - start)
+
+            return res
+
+        def request():
+            if endpoint is None:
+                return send()
+
+            with limiter.limit(endpoint):
+                return send()
+
+        if not retry:
+            return request()
+
+        return self.retrier.call(request, url, stats=self.retry_stats)
+
+    def _report_checksum(self, file_name, hash_match):
+        """Report and record the checksum result of a file."""
+
+        self._checksums[file_name] = hash_match
+
+        if not hash_match:
+            logging.error(f"Checksum mismatch for {file_name}")
+
+        if self.checksum or not hash_match:
+            print(f"Checksum match: {hash_match} - {file_name}")
+            logging.info(f"Checksum match: {hash_match} - {file_name}")
+
     def _parse_url(self, url):
         if not isinstance(url, str) or not _is_url(url):
             raise ValueError("Not a valid URL.")
@@ -197,23 +721,161 @@ class DatasetDownloader:
         except Exception as err:
             raise ValueError(f"Failed to parse URL '{url}'") from err
 
-    def _unpack_single_folder(self, zip_url, output_folder):
-        r = requests.get(zip_url)
-        r.raise_for_status()
+    def _download_to_tempfile(
+        self, url, file_name=None, file_hash=None, file_hash_type=None
+    ):
+        """Stream a file to a temporary file on disk.
+
+        The hash of the file is computed while streaming if checksums are
+        enabled.
+
+        Returns
+        -------
+        file-like:
+            The downloaded file, positioned at the start.
+        """
+
+        h = None
+        if self.checksum and file_hash is not None and _is_hash_type(file_hash_type):
+            h = hashlib.new(file_hash_type)
+
+        # SpooledTemporaryFile isn't usable by zipfile before Python 3.11
+        fp = tempfile.TemporaryFile()
+
+        try:
+            with self._limit(url, "file"), self._request(
+                "GET", url, stream=True
+            ) as res:
+                res.raise_for_status()
+
+                with tqdm(
+                    total=int(res.headers.get("content-length", 0)) or None,
+                    desc=_format_filename(file_name or url.split("/")[-1]),
+                    unit="B",
+                    unit_scale=True,
+                    bar_format="{l_bar}{bar}| {n_fmt}/{total_fmt}",
+                    disable=not self.progress,
+                ) as pbar:
+                    for chunk in res.iter_content(chunk_size=self.policy.chunk_size):
+                        fp.write(chunk)
+                        if h is not None:
+                            h.update(chunk)
+                        pbar.update(len(chunk))
+        except Exception:
+            fp.close()
+            raise
+
+        if h is not None:
+            self._report_checksum(
+                file_name or url, h.hexdigest() == str(file_hash).lower()
+            )
+
+        fp.seek(0)
+        return fp
+
+    def _extract_zip(self, fp, output_folder, flatten=True):
+        """Extract a zip archive member by member.
+
+        Arguments
+        ---------
+        fp: file-like
+            The (seekable) zip archive.
+        output_folder: str
+            The folder to extract the members to.
+        flatten: bool
+            Extract all members into the output folder without their
+            folder structure. Default: True.
+        """
 
-        z = zipfile.ZipFile(io.BytesIO(r.content))
+        with zipfile.ZipFile(fp) as z:
+            members = [
+                m
+                for m in z.infolist()
+                if not m.is_dir() and self._is_included(m.filename)
+            ]
+
+            if flatten:
+                for zip_info in members:
+                    zip_info.filename = os.path.basename(zip_info.filename)
+
+                # the last member wins for duplicate names
+                members = list({m.filename: m for m in members}.values())
+
+            # create the folders upfront, zipfile can't do that concurrently
+            for zip_info in members:
+                parts = [
+                    p for p in zip_info.filename.split("/") if p not in ("", ".", "..")
+                ]
+                Path(output_folder, *parts[:-1]).mkdir(parents=True, exist_ok=True)
+
+            # members are read through a shared, locked file handle
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                list(executor.map(lambda m: z.extract(m, output_folder), members))
+
+    def _list_remote_zip(self, record):
+        """List the members of a zip archive with range requests.
+
+        Returns
+        -------
+        list:
+            The members of the archive as file records, or None if the
+            server doesn't support range requests.
+        """
+
+        try:
+            fp = open_remote_file(record["link"], self.session)
+        except OSError as err:
+            logging.info(f"{err}, falling back to downloading the archive")
+            return None
+
+        self._remote_zip = zipfile.ZipFile(fp)
+
+        return [
+            FileRecord(link=record["link"], name=m.filename, size=m.file_size)
+            for m in self._remote_zip.infolist()
+            if not m.is_dir()
+        ]
+
+    def _extract_remote_zip(self, output_folder):
+        """Fetch and extract the selected members of a remote zip archive."""
+
+        for zip_info in self._remote_zip.infolist():
+            if zip_info.is_dir() or not self._is_included(zip_info.filename):
+                continue
+
+            if (
+                self.max_file_size is not None
+                and zip_info.file_size >= self.max_file_size
+            ):
+                logging.info(f"Skipping large member {zip_info.filename}")
+                if self.progress:
+                    print(f"{_format_filename(zip_info.filename)}: SKIPPED")
+                continue
 
-        for zip_info in z.infolist():
-            if zip_info.filename[-1] == "/":
+            if self.print_only:
+                print(f"{_format_filename(zip_info.filename)}: COMPLETE")
                 continue
-            zip_info.filename = os.path.basename(zip_info.filename)
-            z.extract(zip_info, output_folder)
+
+            logging.info(f"Extracting member {zip_info.filename}")
+            self._remote_zip.extract(zip_info, output_folder)
+            if self.progress:
+                print(f"{_format_filename(zip_info.filename)}: COMPLETE")
+
+    def _unpack_single_folder(
+        self, zip_url, output_folder, file_hash=None, file_hash_type=None
+    ):
+        with self._download_to_tempfile(
+            zip_url, file_hash=file_hash, file_hash_type=file_hash_type
+        ) as fp:
+            self._extract_zip(fp, output_folder)
 
     def _check_checksums(self, output_folder, files_info):
         """Will compare the checksum values in the files_info with the checksums
         of the downloaded files and will create a file in a new 'generated'
         folder with the results.
 
+        Files verified during the download are not hashed again.
+
         Args:
             output_folder (str): output_folder to push the data to
             files_info (list): information on all the files
@@ -224,44 +886,15 @@ class DatasetDownloader:
                 {"BTCBRL_final.csv": true}
         """
         try:
-            checksums = {}
-
-            # loop through the downloaded files in the output_folder
-            for subdir, dirs, files in os.walk(output_folder):
-                logging.info(f"Not using the dirs: {dirs}")
-                for file in files:
-                    filepath = os.path.join(subdir, file)
+            checksums = verify_checksums(
+                output_folder, files_info, skip=self._checksums.keys()
+            )
 
-                    file_comp = list(filter(lambda x: x["name"] == file, files_info))
+            for file, hash_match in checksums.items():
+                print(f"Checksum match: {hash_match} - {file}")
+                logging.info(f"Checksum match: {hash_match} - {file}")
 
-                    try:
-                        hash = file_comp[0]["hash"]
-                        hash_type = file_comp[0]["hash_type"]
-                    except IndexError:
-                        logging.info("Setting hash and hash_type to None")
-                        hash = None
-                        hash_type = None
-
-                    newhash = None
-                    with open(filepath, "rb") as f:
-                        if hash_type == "md5":
-                            newhash = hashlib.md5(f.read()).hexdigest()
-                        if hash_type == "sha1":
-                            newhash = hashlib.sha1(f.read()).hexdigest()
-                        if hash_type == "sha224":
-                            newhash = hashlib.sha224(f.read()).hexdigest()
-                        if hash_type == "sha256":
-                            newhash = hashlib.sha256(f.read()).hexdigest()
-                        if hash_type == "sha384":
-                            newhash = hashlib.sha384(f.read()).hexdigest()
-                        if hash_type == "sha512":
-                            newhash = hashlib.sha512(f.read()).hexdigest()
-                    hash_match = hash == newhash
-
-                    if hash is not None and hash_type is not None:
-                        print(f"Checksum match: {hash_match} - {file}")
-                        logging.info(f"Checksum match: {hash_match} - {file}")
-                        checksums[file] = hash_match
+            checksums.update(self._checksums)
 
             try:
                 timestamp = str(time.time()).split(".")[0]
@@ -279,28 +912,28 @@ class DatasetDownloader:
     def _pre_files(self):
         pass
 
-    def _get_files_recursive(self, url, folder_name=None, base_url=None):
+    def _get_listing_page(self, url, folder_name=None, base_url=None):
+        """Get a single page of the listing of a folder.
+
+        Returns the files and folders on the page in order, as
+        ``("file", record)`` and ``("folder", (url, folder_name))`` items,
+        and the URL of the next page (or None).
+        """
         if not isinstance(url, str):
             ValueError(f"Expected url to be string type, got {type(url)}")
 
-        result = []
-
         # get the data from URL
-        res = requests.get(url)
+        res = self._request("GET", url, "api")
         res.raise_for_status()
         response = res.json()
 
         # find path to raw files
         if hasattr(self, "META_FILES_JSONPATH"):
-            if isinstance(self.META_FILES_JSONPATH, str):
-                jsonpath_expression = parse(self.META_FILES_JSONPATH)
-            else:
-                jsonpath_expression = self.META_FILES_JSONPATH
-
-            files_raw = [x.value for x in jsonpath_expression.find(response)]
+            files_raw = _compile_jsonpath(self.META_FILES_JSONPATH).all(response)
         else:
             files_raw = response
 
+        items = []
         for f in files_raw:
             # create the file or folder path
             if folder_name is None:
@@ -309,32 +942,116 @@ class DatasetDownloader:
                 f_path = str(Path(folder_name, self._get_attr_name(f)))
 
             if self._get_attr_kind(f) == "folder":
-                result.extend(
-                    self._get_files_recursive(
-                        self._get_attr_link(f, base_url=base_url), folder_name=f_path
-                    )
+                items.append(
+                    ("folder", (self._get_attr_link(f, base_url=base_url), f_path))
                 )
             else:
-                result.append(
-                    {
-                        "link": self._get_attr_link(f, base_url=base_url),
-                        "name": f_path,
-                        "size": self._get_attr_size(f),
-                        "hash": self._get_attr_hash(f),
-                        "hash_type": self._get_attr_hash_type(f),
-                    }
+                items.append(
+                    (
+                        "file",
+                        FileRecord(
+                            link=self._get_attr_link(f, base_url=base_url),
+                            name=f_path,
+                            size=self._get_attr_size(f),
+                            hash=self._get_attr_hash(f),
+                            hash_type=self._get_attr_hash_type(f),
+                        ),
+                    )
                 )
 
+        next_url = None
         if hasattr(self, "PAGINATION_JSONPATH"):
-            jsonpath_expression = parse(self.PAGINATION_JSONPATH)
-            next_url = jsonpath_expression.find(response)[0].value
+            next_url = _compile_jsonpath(self.PAGINATION_JSONPATH).first(response)
 
-            if next_url:
-                result.extend(
-                    self._get_files_recursive(next_url, folder_name=folder_name)
-                )
+        return items, next_url
+
+    def _fetch_listing_page(self, url, folder_name=None, base_url=None):
+        """Get a page of the listing from the checkpoint or the repository."""
+        if self._crawl_checkpoint is None:
+            return self._get_listing_page(url, folder_name, base_url)
+
+        page = self._crawl_checkpoint.get(url)
+        if page is None:
+            page = self._get_listing_page(url, folder_name, base_url)
+            self._crawl_checkpoint.add(url, page)
+
+        return page
+
+    def _get_executor(self):
+        """Get the executor for the pages and files of the dataset.
 
-        return result
+        This is the shared executor of a batch (see `datahugger.get_many`)
+        or a new pool of max_workers threads.
+        """
+
+        if self._executor is not None:
+            return self._executor
+
+        return ThreadPoolExecutor(max_workers=max(self.max_workers, 1))
+
+    def _iter_listing(self, folders, base_url=None):
+        """Iterate the files of a tree of folders.
+
+        The folders and pages are fetched with a work queue on a pool of
+        max_workers threads: the subfolders and next page of a page are
+        requested as soon as the page is parsed, while the files are
+        yielded in depth-first order, the same order as a sequential
+        crawl.
+
+        Arguments
+        ---------
+        folders: list
+            The (url, folder_name) pairs of the top-level folders.
+        base_url: str
+            The base URL of relative file links.
+        """
+
+        executor = self._get_executor()
+        pending = set()
+
+        def submit(url, folder_name):
+            future = executor.submit(
+                self._fetch_listing_page, url, folder_name, base_url
+            )
+            pending.add(future)
+            return future, folder_name
+
+        try:
+            # stack of iterators over files and pages that are not listed yet
+            stack = [iter([submit(url, name) for url, name in folders])]
+
+            while stack:
+                item = next(stack[-1], None)
+
+                if item is None:
+                    stack.pop()
+                elif isinstance(item, tuple):
+                    future, folder_name = item
+                    items, next_url = future.result()
+                    pending.discard(future)
+
+                    # prefetch the subfolders and the next page
+                    entries = [
+                        submit(*value) if kind == "folder" else value
+                        for kind, value in items
+                    ]
+                    if next_url:
+                        entries.append(submit(next_url, folder_name))
+
+                    stack.append(iter(entries))
+                else:
+                    yield item
+        finally:
+            # don't wait for pages that are no longer needed
+            for future in pending:
+                future.cancel()
+            executor.shutdown()
+
+    def _iter_files_recursive(self, url, folder_name=None, base_url=None):
+        yield from self._iter_listing([(url, folder_name)], base_url=base_url)
+
+    def _get_files_recursive(self, url, folder_name=None, base_url=None):
+        return list(self._iter_files_recursive(url, folder_name, base_url))
 
     @property
     def _params(self):
@@ -353,10 +1070,11 @@ class DatasetDownloader:
 
         return self.__params
 
-    @property
-    def files(self):
-        if hasattr(self, "_files"):
-            return self._files
+    def _iter_files(self):
+        """Generate the file records from the listing of the repository.
+
+        Services with a custom listing override this method.
+        """
 
         self._pre_files()
 
@@ -364,41 +1082,185 @@ class DatasetDownloader:
         uri = urlparse(url)
         base_url = uri.scheme + "://" + uri.netloc
 
-        self._files = self._get_files_recursive(
+        yield from self._iter_files_recursive(
             self.API_URL_META.format(
                 api_url=self.API_URL, base_url=base_url, **self._params
             ),
             base_url=base_url,
         )
 
+    def _has_custom_files(self):
+        """Check if a subclass lists the files with its own files property.
+
+        Overriding `files` is the previous way to implement a custom
+        listing, `_iter_files` is preferred.
+        """
+
+        return (
+            type(self).files is not DatasetDownloader.files
+            and not self._reading_custom_files
+        )
+
+    def _iter_custom_files(self):
+        """Generate the file records from the files property of a subclass."""
+
+        # the property can use the listing of the base class (super().files)
+        self._reading_custom_files = True
+        try:
+            files = self.files
+        finally:
+            self._reading_custom_files = False
+
+        for f in files:
+            yield f if isinstance(f, FileRecord) else FileRecord.from_dict(f)
+
+    def iter_files(self):
+        """Iterate over the files of the dataset.
+
+        The files are generated while the listing of the repository is
+        crawled, such that downloads can start before the listing is
+        complete. A completed listing is cached in `files`.
+        """
+
+        if hasattr(self, "_files"):
+            yield from self._files
+            return
+
+        if self._has_custom_files():
+            crawl = self._iter_custom_files()
+        else:
+            # resume an interrupted crawl from the checkpoint
+            if self.checkpoint:
+                self._crawl_checkpoint = CrawlCheckpoint(
+                    self.checkpoint, _get_url(self.resource)
+                )
+
+            crawl = self._iter_files()
+        try:
+            records = crawl
+
+            # list the members of a single zip instead of the zip itself
+            if self.remote_unzip:
+                records = list(records)
+                if self._is_single_zip(records):
+                    records = self._list_remote_zip(records[0]) or records
+
+            files = FileList()
+            for f in records:
+                files.append(f)
+                yield f
+
+            self._files = files
+        finally:
+            # stop the crawl before the checkpoint is closed
+            crawl.close()
+
+            if self._crawl_checkpoint is not None:
+                self._crawl_checkpoint.close(completed=hasattr(self, "_files"))
+                self._crawl_checkpoint = None
+
+    @property
+    def files(self):
+        if not hasattr(self, "_files"):
+            for _ in self.iter_files():
+                pass
+
         return self._files
 
+    def _is_single_zip(self, files):
+        return len(files) == 1 and (
+            files[0]["link"].endswith(".zip") or files[0]["name"].endswith(".zip")
+        )
+
+    def _is_included(self, file_name):
+        if not self.include:
+            return True
+
+        return any(fnmatch(file_name, pattern) for pattern in self.include)
+
+    def _load_sync_state(self, output_folder):
+        try:
+            with open(Path(output_folder, SYNC_STATE_FILE)) as f:
+                self._fingerprints = json.load(f)["fingerprints"]
+        except (OSError, ValueError, KeyError):
+            self._fingerprints = {}
+
+    def _save_sync_state(self, output_folder, files_info):
+        Path(output_folder).mkdir(parents=True, exist_ok=True)
+        with open(Path(output_folder, SYNC_STATE_FILE), "w") as f:
+            json.dump(
+                {
+                    "files": [dict(f) for f in files_info],
+                    "fingerprints": self._fingerprints,
+                },
+                f,
+            )
+
     def _get(
         self,
         output_folder: Union[Path, str],
     ):
-        if (
-            len(self.files) == 1
-            and (
-                self.files[0]["link"].endswith(".zip")
-                or self.files[0]["name"].endswith(".zip")
-            )
-            and self.unzip
-        ):
-            self._unpack_single_folder(self.files[0]["link"], output_folder)
+        records = self.iter_files()
+        head = list(itertools.islice(records, 2))
+
+        # the remote zip archive is opened while listing (remote_unzip)
+        if self._remote_zip is not None:
+            for _ in records:
+                pass
+
+            self._extract_remote_zip(output_folder)
             return
 
-        files_info = []
-        for f in self.files:
-            files_info.append(f)
-            self.download_file(
-                f["link"],
+        if self.unzip and self._is_single_zip(head):
+            self._unpack_single_folder(
+                head[0]["link"],
                 output_folder,
-                file_name=f["name"],
-                file_size=f["size"],
-                file_hash=f["hash"],
-                file_hash_type=f["hash_type"],
+                file_hash=head[0]["hash"],
+                file_hash_type=head[0]["hash_type"],
             )
+            return
+
+        files_info = []
+        errors = []
+
+        if self.sync:
+            self._load_sync_state(output_folder)
+
+        with self._get_executor() as executor:
+            # start downloading while the listing is crawled
+            futures = {}
+            for f in itertools.chain(head, records):
+                if not self._is_included(f["name"]):
+                    continue
+
+                files_info.append(f)
+                future = executor.submit(
+                    self.download_file,
+                    f["link"],
+                    output_folder,
+                    file_name=f["name"],
+                    file_size=f["size"],
+                    file_hash=f["hash"],
+                    file_hash_type=f["hash_type"],
+                )
+                futures[future] = f
+
+            for future in as_completed(futures):
+                try:
+                    future.result()
+                except Exception as err:
+                    f = futures[future]
+                    logging.error(f"Failed to download file {f['link']}: {err}")
+                    if self.progress:
+                        print(f"{_format_filename(f['name'])}: FAILED")
+                    errors.append(err)
+
+        if self.sync:
+            self._save_sync_state(output_folder, files_info)
+
+        # raise the first error after all other files are processed
+        if errors:
+            raise errors[0]
 
         if self.checksum:
             self._check_checksums(output_folder=output_folder, files_info=files_info)
@@ -0,0 +1,323 @@
+import logging
+import re
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import as_completed
+from pathlib import Path
+
+from datahugger.api import info
+from datahugger.manifest import is_manifest
+from datahugger.scheduler import FairExecutor
+from datahugger.session import create_session
+from datahugger.utils import _get_url
+
+
+class BatchResult:
+    """Result of a single resource of a batch.
+
+    Arguments
+    ---------
+    resource: str
+        The URL, DOI, or Handle of the dataset.
+    dataset: datahugger.base.DatasetDownloader
+        The dataset download object, or None if the resolution failed.
+    result: datahugger.base.DownloadResult
+        The result of the download, or None if the dataset wasn't
+        downloaded.
+    error: Exception
+        The error of the resource, or None if it succeeded.
+    """
+
+    def __init__(self, resource, dataset=None, result=None, error=None):
+        self.resource = resource
+        self.dataset = dataset
+        self.result = result
+        self.error = error
+
+    def __str__(self):
+        status = "ok" if self.ok else "error"
+        return f"<{self.__class__.__name__} resource={self.resource} {status}>"
+
+    @property
+    def ok(self):
+        return self.error is None
+
+    def to_dict(self):
+        """Get the result as a JSON serializable dict."""
+
+        d = {"resource": str(self.resource), "ok": self.ok}
+
+        if self.dataset is not None:
+            d["service"] = self.dataset.__class__.__name__
+            d["url"] = _get_url(self.dataset.resource)
+
+            # the listing is only available if it was crawled
+            if hasattr(self.dataset, "_files"):
+                d["n_files"] = len(self.dataset.files)
+                d["total_size"] = self.dataset.files.total_size
+
+        if self.result is not None:
+            d["output_folder"] = str(self.result.output_folder)
+
+        if self.error is not None:
+            d["error"] = {
+                "type": self.error.__class__.__name__,
+                "message": str(self.error),
+            }
+
+        return d
+
+
+def get_output_folder(output_root, resource):
+    """Get the folder of a resource in the output root.
+
+    The folder name is the resource without the URL scheme, with all
+    characters other than letters, digits, dots and dashes replaced, e.g.
+    '10.5281_zenodo.6614829' or 'osf.io_ews27'. The folder of a manifest
+    is named after the manifest file.
+    """
+
+    if is_manifest(resource):
+        return Path(output_root, Path(resource).stem)
+
+    name = re.sub(r"^[a-z]+://", "", str(resource).strip(), flags=re.IGNORECASE)
+    name = re.sub(r"[^\w.-]+", "_", name).strip("_.")
+
+    return Path(output_root, name)
+
+
+def _process(resource, output_root, executor, key, options):
+    dataset = None
+
+    try:
+        dataset = info(resource, **options)
+
+        # the pages and files of the dataset are fetched on the shared pool
+        dataset._executor = executor.for_key(key)
+
+        if output_root is None:
+            for _ in dataset.iter_files():
+                pass
+            return BatchResult(resource, dataset=dataset)
+
+        result = dataset.download(get_output_folder(output_root, resource))
+        return BatchResult(resource, dataset=dataset, result=result)
+
+    except Exception as err:
+        logging.error(f"Failed to process {resource}: {err}")
+        return BatchResult(resource, dataset=dataset, error=err)
+
+
+def iter_many(
+    resources,
+    output_root=None,
+    max_workers=4,
+    max_datasets=None,
+    cache=False,
+    session=None,
+    ordered=False,
+    **kwargs,
+):
+    """Iterate over the results of a batch of datasets.
+
+    See `get_many` for the arguments. Without output_root, the datasets
+    are resolved and listed, but not downloaded.
+
+    Arguments
+    ---------
+    ordered: bool
+        Yield the results in the order of the resources instead of the
+        order of completion. Default: False.
+
+    Returns
+    -------
+    iterator:
+        The BatchResult of each resource.
+    """
+
+    if max_datasets is None:
+        max_datasets = max_workers
+
+    if session is None:
+        session = create_session(max_workers * kwargs.get("segments", 1), cache=cache)
+
+    options = dict(max_workers=max_workers, cache=cache, session=session, **kwargs)
+
+    with FairExecutor(max_workers) as executor, ThreadPoolExecutor(
+        max_workers=max_datasets
+    ) as datasets:
+        futures = [
+            datasets.submit(_process, resource, output_root, executor, i, options)
+            for i, resource in enumerate(resources)
+        ]
+
+        for future in futures if ordered else as_completed(futures):
+            yield future.result()
+
+
+def info_many(
+    resources,
+    max_file_size=None,
+    params=None,
+    remote_unzip=False,
+    include=None,
+    max_workers=4,
+    max_datasets=None,
+    cache=False,
+    session=None,
+):
+    """Get info on the content of many datasets.
+
+    The datasets are resolved and listed concurrently, see `get_many`.
+
+    Arguments
+    ---------
+    resources: list
+        The URLs, DOIs, or Handles of the datasets.
+    max_file_size: int
+        The maximum number of bytes for a single file. If exceeded,
+        the file is skipped.
+    params: dict
+        Extra parameters for the request. The transfer policy of the
+        service can be overridden with the params max_connections,
+        api_rate, file_rate (requests per minute), chunk_size and segments.
+    remote_unzip: bool
+        List the members of datasets that are a single zip file.
+        Default: False.
+    include: list
+        Only list the files that match one of these glob patterns.
+        Default: all files.
+    max_workers: int
+        The number of requests (pages and files) of all datasets together
+        at the same time. Default: 4.
+    max_datasets: int
+        The number of datasets that are processed at the same time.
+        Default: max_workers.
+    cache: bool, str, pathlib.Path
+        Cache the resolved identifiers and the responses of metadata
+        requests on disk. Default: False.
+    session: requests.Session
+        The session shared by all datasets. Default: a new session.
+
+    Returns
+    -------
+    list:
+        The BatchResult of each resource, in the order of the resources.
+    """
+
+    results = iter_many(
+        resources,
+        max_file_size=max_file_size,
+        params=params,
+        remote_unzip=remote_unzip,
+        include=include,
+        progress=False,
+        max_workers=max_workers,
+        max_datasets=max_datasets,
+        cache=cache,
+        session=session,
+        ordered=True,
+    )
+
+    return list(results)
+
+
+def get_many(
+    resources,
+    output_root,
+    max_file_size=None,
+    force_download=False,
+    unzip=True,
+    checksum=False,
+    progress=False,
+    params=None,
+    segments=1,
+    sync=False,
+    remote_unzip=False,
+    include=None,
+    max_workers=4,
+    max_datasets=None,
+    cache=False,
+    session=None,
+):
+    """Get the content of many datasets.
+
+    Each dataset is downloaded to its own folder in the output root. The
+    listing pages and files of all datasets are fetched on one shared pool
+    of max_workers threads, which takes the requests of the datasets in
+    turn, such that a large dataset doesn't hold up the others. A failing
+    dataset doesn't stop the batch: its error is returned in its result.
+
+    Arguments
+    ---------
+    resources: list
+        The URLs, DOIs, or Handles of the datasets.
+    output_root: str, pathlib.Path
+        The folder to download the datasets to, in a subfolder per
+        dataset (e.g. '10.5281_zenodo.6614829').
+    max_file_size: int
+        The maximum number of bytes for a single file. If exceeded,
+        the file is skipped.
+    force_download: bool
+        Force the download of the datasets even if there are already
+        files in the destination folder. Default: False.
+    unzip: bool
+        Unzip is the output is a single zip file. Default: True.
+    checksum: bool
+        Checksum will check the checksum of downloaded files. Default: False.
+    progress: bool
+        Print the progress of the downloads. Default: False.
+    params: dict
+        Extra parameters for the request. The transfer policy of the
+        service can be overridden with the params max_connections,
+        api_rate, file_rate (requests per minute), chunk_size and segments.
+    segments: int
+        Download large files in this number of parallel byte ranges if the
+        server supports range requests. Default: 1 (no segments, unless
+        the service prefers segments).
+    sync: bool
+        Only download the files that are missing or changed. Default: False.
+    remote_unzip: bool
+        Only fetch the included members of datasets that are a single zip
+        file. Default: False.
+    include: list
+        Only download the files that match one of these glob patterns.
+        Default: all files.
+    max_workers: int
+        The number of requests (pages and files) of all datasets together
+        at the same time. Default: 4.
+    max_datasets: int
+        The number of datasets that are processed at the same time.
+        Default: max_workers.
+    cache: bool, str, pathlib.Path
+        Cache the resolved identifiers and the responses of metadata
+        requests on disk. Default: False.
+    session: requests.Session
+        The session shared by all datasets. Default: a new session.
+
+    Returns
+    -------
+    list:
+        The BatchResult of each resource, in the order of the resources.
+    """
+
+    results = iter_many(
+        resources,
+        output_root,
+        max_file_size=max_file_size,
+        force_download=force_download,
+        unzip=unzip,
+        checksum=checksum,
+        progress=progress,
+        params=params,
+        segments=segments,
+        sync=sync,
+        remote_unzip=remote_unzip,
+        include=include,
+        max_workers=max_workers,
+        max_datasets=max_datasets,
+        cache=cache,
+        session=session,
+        ordered=True,
+    )
+
+    return list(results)
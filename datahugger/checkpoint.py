@@ -0,0 +1,109 @@
+import json
+import logging
+import os
+import threading
+
+from datahugger.files import FileRecord
+
+
+class CrawlCheckpoint:
+    """Checkpoint of the pages of a listing crawled so far.
+
+    Every crawled page (its files, folders and next page) is appended to
+    a JSON lines file as soon as it is fetched. If the crawl of the same
+    resource is interrupted, the next crawl reads the fetched pages from
+    the checkpoint and only requests the pages that are missing.
+
+    Arguments
+    ---------
+    path: str, pathlib.Path
+        The checkpoint file.
+    resource: str
+        The URL of the resource that is crawled. A checkpoint of another
+        resource is discarded.
+    """
+
+    def __init__(self, path, resource):
+        self.path = path
+        self.resource = resource
+        self._size = 0
+        self.pages = self._load()
+        self._lock = threading.Lock()
+
+        if self.pages:
+            # drop the incomplete last line of an interrupted crawl, such
+            # that new pages start on a line of their own
+            os.truncate(self.path, self._size)
+        self._fp = open(self.path, "a" if self.pages else "w")
+        if not self.pages:
+            self._write({"resource": self.resource})
+
+        logging.info(f"Resume crawl with {len(self.pages)} pages from {self.path}")
+
+    def _load(self):
+        """Read the pages of the checkpoint.
+
+        The size of the complete lines read is stored in self._size.
+        """
+
+        pages = {}
+
+        try:
+            with open(self.path, "rb") as f:
+                line = f.readline()
+                if json.loads(line).get("resource") != self.resource:
+                    return {}
+                size = len(line)
+
+                for line in f:
+                    # the last line of an interrupted crawl can be incomplete
+                    if not line.endswith(b"\n"):
+                        break
+                    try:
+                        page = json.loads(line)
+                    except ValueError:
+                        break
+                    items = [
+                        (kind, FileRecord(**value) if kind == "file" else value)
+                        for kind, value in page["items"]
+                    ]
+                    pages[page["url"]] = (items, page["next_url"])
+                    size += len(line)
+        except (OSError, ValueError, AttributeError):
+            return {}
+
+        self._size = size
+
+        return pages
+
+    def _write(self, record):
+        self._fp.write(json.dumps(record) + "\n")
+        self._fp.flush()
+
+    def get(self, url):
+        """Get a crawled page, or None if the page isn't crawled yet."""
+        return self.pages.get(url)
+
+    def add(self, url, page):
+        """Add a crawled page to the checkpoint."""
+        items, next_url = page
+
+        with self._lock:
+            self.pages[url] = page
+            self._write(
+                {
+                    "url": url,
+                    "items": [
+                        (kind, dict(value) if kind == "file" else value)
+                        for kind, value in items
+                    ],
+                    "next_url": next_url,
+                }
+            )
+
+    def close(self, completed=False):
+        """Close the checkpoint, and remove it if the crawl is completed."""
+        self._fp.close()
+
+        if completed:
+            os.remove(self.path)
@@ -1,3 +1,7 @@
+import re
+
+from datahugger.matching import HostMatcher
+from datahugger.matching import PatternMatcher
 from datahugger.services import ArXivDataset
 from datahugger.services import B2shareDataset
 from datahugger.services import DataDryadDataset
@@ -130,6 +134,61 @@ SERVICES_NETLOC_REGEXP = {
     r".*\/dataset\.xhtml\?persistentId\=.*": DataverseDataset,
 }
 
+# precompiled matchers of the hostnames (and their www subdomain) and the
+# URL patterns, such that a lookup doesn't depend on the size of the registry
+SERVICES_HOST_MATCHER = HostMatcher(SERVICES_NETLOC)
+SERVICES_URL_MATCHER = PatternMatcher(SERVICES_NETLOC_REGEXP)
+
+# DOI lookup (case-insensitive) of the service and the landing page of the
+# dataset, such that the DOI doesn't need to be resolved with doi.org. An
+# optional third value normalizes the named groups, e.g. to the case of the
+# identifiers in the API of the service.
+SERVICES_DOI = {
+    r"10\.5281/zenodo\.(?P<record_id>\d+)": (
+        ZenodoDataset,
+        "https://zenodo.org/records/{record_id}",
+    ),
+    r"10\.5061/dryad\.[0-9a-z]+": (
+        DataDryadDataset,
+        "https://datadryad.org/dataset/doi:{doi}",
+    ),
+    r"10\.7910/DVN/[0-9a-z]+": (
+        DataverseDataset,
+        "https://dataverse.harvard.edu/dataset.xhtml?persistentId=doi:{doi}",
+    ),
+    r"10\.34894/[0-9a-z]+": (
+        DataverseDataset,
+        "https://dataverse.nl/dataset.xhtml?persistentId=doi:{doi}",
+    ),
+    r"10\.6084/m9\.figshare\.(?P<record_id>\d+)\.v(?P<version>\d+)": (
+        FigShareDataset,
+        "https://figshare.com/articles/dataset/_/{record_id}/{version}",
+    ),
+    r"10\.6084/m9\.figshare\.(?P<record_id>\d+)": (
+        FigShareDataset,
+        "https://figshare.com/articles/dataset/_/{record_id}",
+    ),
+    r"10\.17605/OSF\.IO/(?P<record_id>[0-9a-z]+)": (
+        OSFDataset,
+        "https://osf.io/{record_id}/",
+        str.lower,
+    ),
+    r"10\.17632/(?P<record_id>[0-9a-z]+)\.(?P<version>\d+)": (
+        MendeleyDataset,
+        "https://data.mendeley.com/datasets/{record_id}/{version}",
+    ),
+    r"10\.1594/PANGAEA\.\d+": (
+        PangaeaDataset,
+        "https://doi.pangaea.de/{doi}",
+    ),
+    r"10\.48550/arXiv\.(?P<record_id>.+)": (
+        ArXivDataset,
+        "https://arxiv.org/abs/{record_id}",
+    ),
+}
+
+SERVICES_DOI_MATCHER = PatternMatcher(SERVICES_DOI, flags=re.IGNORECASE, fullmatch=True)
+
 # add keys in lower-case for fast case-insensitive lookups
 RE3DATA_SOFTWARE = {
     "dataverse": DataverseDataset,
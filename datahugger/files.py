@@ -0,0 +1,175 @@
+import re
+from fnmatch import translate
+from operator import itemgetter
+
+# the attributes of a file in the listing of a dataset
+FILE_FIELDS = ("link", "name", "size", "hash", "hash_type")
+
+
+def _field(name):
+    def get(self):
+        return self[name]
+
+    def set(self, value):
+        self[name] = value
+
+    return property(get, set, doc=f"The '{name}' of the file.")
+
+
+class FileRecord(dict):
+    """A file in the listing of a dataset.
+
+    The record is a dict with the keys 'link', 'name', 'size', 'hash' and
+    'hash_type', such that it can be changed and serialized (e.g. to JSON)
+    like the dicts of the listing before. The attributes are available as
+    properties too, e.g. record.name.
+
+    Arguments
+    ---------
+    link: str
+        The URL to download the file from.
+    name: str
+        The path of the file in the dataset.
+    size: int
+        The size of the file in bytes, None if unknown.
+    hash: str
+        The hash of the file, None if unknown.
+    hash_type: str
+        The type of the hash, e.g. 'md5'.
+    """
+
+    __slots__ = ()
+
+    link = _field("link")
+    name = _field("name")
+    size = _field("size")
+    hash = _field("hash")
+    hash_type = _field("hash_type")
+
+    def __init__(self, link=None, name=None, size=None, hash=None, hash_type=None):
+        super().__init__(
+            link=link, name=name, size=size, hash=hash, hash_type=hash_type
+        )
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({super().__repr__()})"
+
+    @classmethod
+    def from_dict(cls, d):
+        """Create a record from a dict with (some of) the attributes."""
+        return cls(*(d.get(field) for field in FILE_FIELDS))
+
+    def to_dict(self):
+        return dict(self)
+
+
+class FileList(list):
+    """The files in the listing of a dataset.
+
+    The list holds FileRecord objects (dicts), such that it can be changed
+    in place and serialized (e.g. to JSON) like the list of dicts before.
+    On top of that, it can select files by size and name, sort them and
+    sum their sizes.
+
+    Arguments
+    ---------
+    records: iterable
+        The files (FileRecord objects or dicts) to store.
+    """
+
+    def __init__(self, records=()):
+        super().__init__(
+            r if isinstance(r, FileRecord) else FileRecord.from_dict(r) for r in records
+        )
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return FileList(super().__getitem__(index))
+
+        return super().__getitem__(index)
+
+    def __add__(self, other):
+        return FileList(list.__add__(self, list(other)))
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} n_files={len(self)}>"
+
+    def column(self, field):
+        """Get the values of an attribute of all files.
+
+        Arguments
+        ---------
+        field: str
+            The attribute, e.g. 'size'.
+
+        Returns
+        -------
+        list:
+            The values of the attribute, in the order of the files.
+        """
+
+        return [record[field] for record in self]
+
+    @property
+    def total_size(self):
+        """The total size of the files with a known size."""
+        return sum(record["size"] for record in self if record["size"] is not None)
+
+    def filter(self, min_size=None, max_size=None, name=None, pattern=None):
+        """Select files by size and name.
+
+        Files with an unknown size are never excluded by size.
+
+        Arguments
+        ---------
+        min_size: int
+            The minimal size of the files in bytes.
+        max_size: int
+            The maximal size of the files in bytes.
+        name: str
+            A regular expression that matches (part of) the file names.
+        pattern: str, list
+            One or more glob patterns of file names, e.g. "*.csv".
+
+        Returns
+        -------
+        FileList:
+            The selected files, the same records as in this list.
+        """
+
+        records = self
+
+        if min_size is not None:
+            records = [r for r in records if r["size"] is None or r["size"] >= min_size]
+
+        if max_size is not None:
+            records = [r for r in records if r["size"] is None or r["size"] <= max_size]
+
+        if name is not None:
+            regexp = re.compile(name)
+            records = [r for r in records if regexp.search(r["name"])]
+
+        if pattern is not None:
+            patterns = [pattern] if isinstance(pattern, str) else pattern
+            regexp = re.compile("|".join(translate(p) for p in patterns))
+            records = [r for r in records if regexp.match(r["name"])]
+
+        return FileList(records)
+
+    def sort(self, key="name", reverse=False):
+        """Sort the files in place.
+
+        Arguments
+        ---------
+        key: str, callable
+            The attribute to sort on, or a function of a FileRecord.
+            Default: 'name'.
+        reverse: bool
+            Sort in descending order. Default: False.
+        """
+
+        super().sort(key=key if callable(key) else itemgetter(key), reverse=reverse)
+
+    def to_list(self):
+        """Get the files as a list of plain dicts."""
+        return [dict(record) for record in self]
@@ -1,13 +1,43 @@
 import logging
 import re
 
-import requests
-
 from datahugger.exceptions import DOIError
 from datahugger.metadata import MetaData
+from datahugger.retry import request_with_retry
+from datahugger.session import get_session
 from datahugger.utils import _is_url
 
-__all__ = ["ArXiv", "DOI", "Handle", "is_doi", "is_handle", "is_arxiv"]
+__all__ = [
+    "ArXiv",
+    "DOI",
+    "Handle",
+    "is_doi",
+    "is_handle",
+    "is_arxiv",
+    "parse_identifier",
+]
+
+# Thanks to Andrew Gilmartin
+# https://www.crossref.org/blog/dois-and-matching-regular-expressions/
+DOI_REGEXP = re.compile(r"^10.\d{4,9}/[-._;()/:A-Z0-9]+$", re.IGNORECASE)
+HANDLE_REGEXP = re.compile(r"^https\:\/\/hdl\.handle\.net\/(.*)$", re.IGNORECASE)
+ARXIV_REGEXP = re.compile(
+    r".*(arxiv\.org/abs/|arXiv:)(\d{4}.\d{4,5}|[a-z\-]+(\.[A-Z]{2})?\/\d{7})(v\d+)?$",
+    re.IGNORECASE,
+)
+
+# the patterns above in a single expression, tried in the same order (DOI,
+# Handle, arXiv), such that an identifier is classified in a single match
+IDENTIFIER_REGEXP = re.compile(
+    r"^(?:"
+    r"(?-i:doi:)?(?:[a-z][a-z0-9+.-]*://[^/?#]*(?-i:doi\.org)/)?"
+    r"(?P<doi>10.\d{4,9}/[-._;()/:A-Z0-9]+)"
+    r"|(?-i:hdl:)?(?P<handle>https\:\/\/hdl\.handle\.net\/.*)"
+    r"|.*(?:arxiv\.org/abs/|arXiv:)"
+    r"(?P<arxiv>\d{4}.\d{4,5}|[a-z\-]+(?:\.[A-Z]{2})?\/\d{7})(?:v\d+)?"
+    r")$",
+    re.IGNORECASE,
+)
 
 
 class DOI:
@@ -28,9 +58,7 @@ class DOI:
         if _is_url(doi_str) and "doi.org" in doi_str:
             doi_str = doi_str.split("doi.org/")[1]
 
-        # Thanks to Andrew Gilmartin
-        # https://www.crossref.org/blog/dois-and-matching-regular-expressions/
-        match = re.match(r"^10.\d{4,9}/[-._;()/:A-Z0-9]+$", doi_str, re.IGNORECASE)
+        match = DOI_REGEXP.match(doi_str)
         if not (match is not None and match.group() is not None):
             raise ValueError("Not a valid DOI")
 
@@ -45,18 +73,24 @@ class DOI:
 
         return None
 
-    def resolve(self):
+    def resolve(self, session=None):
         if hasattr(self, "_resolved_url"):
             return self._resolved_url
 
+        session = get_session(session)
+
         url = f"https://doi.org/{self.doi}"
-        r = requests.head(url, allow_redirects=True, timeout=(3, 10))
+        r = request_with_retry(
+            session, "HEAD", url, allow_redirects=True, timeout=(3, 10)
+        )
 
         if r.status_code == 404 and r.url and r.url.startswith("https://doi.org"):
             raise DOIError(f"DOI {self.doi} not found in the DOI system")
         elif r.status_code in [404, 405]:
             # head request not allowed or possible, try get request
-            r = requests.get(url, allow_redirects=True, timeout=(3, 10))
+            r = request_with_retry(
+                session, "GET", url, allow_redirects=True, timeout=(3, 10)
+            )
         elif r.status_code in [403]:
             # Most likely a service that tries to prevent webscraping.
             # Might still have an API, so forwaring the response url.
@@ -115,7 +149,7 @@ class Handle:
         if s.startswith("hdl:"):
             s = s[4:]
 
-        match = re.match(r"^https\:\/\/hdl\.handle\.net\/(.*)$", s, re.IGNORECASE)
+        match = HANDLE_REGEXP.match(s)
         if not (match is not None and match.group() is not None):
             raise ValueError("Not a valid Handle")
 
@@ -130,18 +164,24 @@ class Handle:
 
         return None
 
-    def resolve(self):
+    def resolve(self, session=None):
         if hasattr(self, "_resolved_url"):
             return self._resolved_url
 
+        session = get_session(session)
+
         url = f"https://hdl.handle.net/{self.handle}"
-        r = requests.head(url, allow_redirects=True, timeout=(3, 10))
+        r = request_with_retry(
+            session, "HEAD", url, allow_redirects=True, timeout=(3, 10)
+        )
 
         if r.status_code == 404 and r.url and r.url.startswith("https://handle.org"):
             raise ValueError(f"Handle {self.handle} not found in the Handle system")
         elif r.status_code in [404, 405]:
             # head request not allowed or possible, try get request
-            r = requests.get(url, allow_redirects=True, timeout=(3, 10))
+            r = request_with_retry(
+                session, "GET", url, allow_redirects=True, timeout=(3, 10)
+            )
         elif r.status_code in [403]:
             # Most likely a service that tries to prevent webscraping.
             # Might still have an API, so forwaring the response url.
@@ -189,11 +229,7 @@ class ArXiv:
 
     @classmethod
     def parse(cls, s):
-        match = re.match(
-            r".*(arxiv\.org/abs/|arXiv:)(\d{4}.\d{4,5}|[a-z\-]+(\.[A-Z]{2})?\/\d{7})(v\d+)?$",
-            s,
-            re.IGNORECASE,
-        )
+        match = ARXIV_REGEXP.match(s)
 
         if not (match is not None and match.group() is not None):
             raise ValueError("Not a valid arXiv identifier")
@@ -234,3 +270,42 @@ def is_arxiv(s: str) -> bool:
         return True
     except ValueError:
         return False
+
+
+def parse_identifier(s):
+    """Parse a DOI, Handle, arXiv identifier or URL in a single pass.
+
+    The identifier is matched once against a precompiled expression of
+    all identifier types, instead of trying to parse each type in turn.
+
+    Parameters
+    ----------
+    s: str
+        The identifier or URL to parse.
+
+    Returns
+    -------
+    DOI, Handle, ArXiv, str:
+        The parsed identifier, or the string itself if it is a URL.
+
+    Raises
+    ------
+    ValueError
+        If the string isn't an identifier or URL.
+    """
+
+    match = IDENTIFIER_REGEXP.match(s)
+
+    if match is not None:
+        if match["doi"] is not None:
+            return DOI(match["doi"])
+        if match["handle"] is not None:
+            return Handle(match["handle"])
+        return ArXiv(match["arxiv"])
+
+    if _is_url(s):
+        return s
+
+    raise ValueError(
+        f"'{s}' is not a correct resource identifier (e.g. a URL, DOI, Handle)"
+    )
@@ -0,0 +1,84 @@
+import json
+from pathlib import Path
+
+from datahugger.files import FileList
+from datahugger.resolvers import _get_service_class
+from datahugger.utils import _get_url
+
+# version of the format of the manifest
+MANIFEST_VERSION = 1
+
+
+def is_manifest(resource):
+    """Check if the resource is a manifest file."""
+
+    return (
+        isinstance(resource, (str, Path))
+        and str(resource).endswith(".json")
+        and Path(resource).is_file()
+    )
+
+
+def write_manifest(dataset, fp):
+    """Write the service and file listing of a dataset to a manifest.
+
+    The manifest pins the dataset: `read_manifest` creates the downloader
+    of the dataset from it without resolving the identifier or crawling
+    the listing of the repository.
+
+    Arguments
+    ---------
+    dataset: datahugger.base.DatasetDownloader
+        The dataset to write the manifest of.
+    fp: str, pathlib.Path
+        The manifest file (.json).
+    """
+
+    if dataset.remote_unzip:
+        raise ValueError("Manifests of zip members (remote_unzip) are not supported.")
+
+    from datahugger import __version__
+
+    manifest = {
+        "manifest_version": MANIFEST_VERSION,
+        "datahugger_version": __version__,
+        "resource": _get_url(dataset.resource),
+        "service": dataset.__class__.__name__,
+        "params": dataset._params,
+        "files": dataset.files.to_list(),
+    }
+
+    with open(fp, "w") as f:
+        json.dump(manifest, f, indent=2)
+
+
+def read_manifest(fp, **kwargs):
+    """Create the downloader of a dataset from a manifest.
+
+    Arguments
+    ---------
+    fp: str, pathlib.Path
+        The manifest file (.json).
+    kwargs:
+        The options of the downloader, see `datahugger.info`.
+
+    Returns
+    -------
+    datahugger.base.DatasetDownloader
+        The dataset download object with the listing of the manifest.
+    """
+
+    with open(fp) as f:
+        manifest = json.load(f)
+
+    if manifest.get("manifest_version") != MANIFEST_VERSION:
+        raise ValueError(f"'{fp}' is not a valid manifest.")
+
+    service_class = _get_service_class(manifest["service"])
+    if service_class is None:
+        raise ValueError(f"Unknown service '{manifest['service']}' in '{fp}'.")
+
+    dataset = service_class(manifest["resource"], **kwargs)
+    dataset._files = FileList(manifest["files"])
+
+    return dataset
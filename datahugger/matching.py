@@ -0,0 +1,96 @@
+import re
+
+
+class HostMatcher:
+    """Match hostnames to values.
+
+    A hostname matches a registered hostname exactly, or with one of the
+    given subdomains (e.g. 'www.zenodo.org' matches 'zenodo.org'). Other
+    subdomains don't match, as they are often other deployments (e.g.
+    'sandbox.zenodo.org') with other records than the registered host.
+
+    Arguments
+    ---------
+    hosts: dict
+        The hostnames and their values.
+    subdomains: iterable
+        The subdomains that match the registered hostnames as well.
+        Default: www.
+    """
+
+    def __init__(self, hosts, subdomains=("www",)):
+        self._hosts = {host.lower(): value for host, value in hosts.items()}
+        self._subdomains = {f"{subdomain}." for subdomain in subdomains}
+
+    def match(self, hostname):
+        """Get the value of the hostname, or None if it doesn't match."""
+
+        value = self._hosts.get(hostname)
+        if value is not None:
+            return value
+
+        subdomain, _, host = hostname.partition(".")
+        if f"{subdomain}." in self._subdomains:
+            return self._hosts.get(host)
+
+        return None
+
+
+class PatternMatcher:
+    """Match strings to values with a list of regular expressions.
+
+    The expressions are combined into a single precompiled alternation.
+    The value of the first expression that matches (at the start of the
+    string) is returned, like trying each expression in order.
+
+    Arguments
+    ---------
+    patterns: dict
+        The regular expressions and their values.
+    flags: int
+        The flags of the regular expressions, e.g. re.IGNORECASE.
+    fullmatch: bool
+        Only match the expressions against the whole string.
+    """
+
+    def __init__(self, patterns, flags=0, fullmatch=False):
+        self._values = list(patterns.values())
+
+        # the named groups are numbered per expression to keep them unique
+        self._groups = []
+        alternatives = []
+        for i, pattern in enumerate(patterns):
+            self._groups.append(list(re.compile(pattern, flags).groupindex))
+            pattern = re.sub(r"\(\?P<(\w+)>", rf"(?P<_{i}_\1>", pattern)
+            alternatives.append(f"(?P<_{i}>{pattern})")
+
+        regexp = re.compile("|".join(alternatives), flags)
+        self._match = regexp.fullmatch if fullmatch else regexp.match
+
+    def match(self, s):
+        """Get the value of the first matching expression, or None."""
+
+        m = self._match(s)
+        if m is None:
+            return None
+
+        return self._values[int(m.lastgroup[1:])]
+
+    def match_groups(self, s):
+        """Get the value and named groups of the first matching expression.
+
+        Returns
+        -------
+        tuple:
+            The value and a dict with the named groups of the expression,
+            or None if no expression matches.
+        """
+
+        m = self._match(s)
+        if m is None:
+            return None
+
+        i = int(m.lastgroup[1:])
+        groups = {name: m[f"_{i}_{name}"] for name in self._groups[i]}
+
+        return self._values[i], groups
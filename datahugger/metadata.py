@@ -1,14 +1,15 @@
-import requests
+from datahugger.session import get_session
 
 
 class MetaData:
     """MetaData for a resource"""
 
-    def __init__(self, resource):
+    def __init__(self, resource, session=None):
         self.resource = resource
+        self.session = session
 
     def _get_doi_metadata(self, content_type):
-        r = requests.get(
+        r = get_session(self.session).get(
             f"https://doi.org/{self.resource}",
             headers={"Accept": content_type},
         )
@@ -0,0 +1,332 @@
+import threading
+import time
+from contextlib import contextmanager
+
+# number of bytes read from the response per write
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+# params that override the transfer policy of a service (e.g. -p chunk_size=1024)
+POLICY_PARAMS = (
+    "max_connections",
+    "api_rate",
+    "file_rate",
+    "chunk_size",
+    "segments",
+    "adaptive",
+)
+
+# policy params with a boolean value (e.g. -p adaptive=true)
+BOOLEAN_PARAMS = ("adaptive",)
+
+# upper bound of the adaptive concurrency without max_connections
+DEFAULT_ADAPTIVE_MAX_CONNECTIONS = 64
+
+
+class TransferPolicy:
+    """Limits and preferences of the transfers with a service.
+
+    Arguments
+    ---------
+    max_connections: int
+        The maximum number of concurrent requests per host. Default: no
+        limit (max_workers).
+    api_rate: int
+        The maximum number of requests per minute to the API (listing and
+        metadata) per host. Default: no limit.
+    file_rate: int
+        The maximum number of requests per minute for files per host.
+        Default: no limit.
+    chunk_size: int
+        The number of bytes read from the response per write.
+    segments: int
+        The number of byte ranges to download large files in, if the
+        server supports range requests. Default: 1 (no segments).
+    adaptive: bool
+        Adapt the number of concurrent requests per host to the capacity
+        of the server (AIMD), up to max_connections. Default: False.
+    """
+
+    def __init__(
+        self,
+        max_connections=None,
+        api_rate=None,
+        file_rate=None,
+        chunk_size=DEFAULT_CHUNK_SIZE,
+        segments=1,
+        adaptive=False,
+    ):
+        self.max_connections = max_connections
+        self.api_rate = api_rate
+        self.file_rate = file_rate
+        self.chunk_size = chunk_size
+        self.segments = segments
+        self.adaptive = adaptive
+
+    def __repr__(self):
+        values = ", ".join(f"{k}={getattr(self, k)}" for k in POLICY_PARAMS)
+        return f"{self.__class__.__name__}({values})"
+
+    def replace(self, **kwargs):
+        """Get a copy of the policy with the given (not None) values."""
+
+        values = {k: getattr(self, k) for k in POLICY_PARAMS}
+        values.update({k: v for k, v in kwargs.items() if v is not None})
+
+        return TransferPolicy(**values)
+
+    def override(self, params):
+        """Get a copy of the policy with the values in params.
+
+        Values in params can be strings (e.g. from the command line).
+
+        Raises
+        ------
+        ValueError
+            If a value isn't valid for the param.
+        """
+
+        if not params:
+            return self
+
+        return self.replace(
+            **{k: _parse_param(k, v) for k, v in params.items() if k in POLICY_PARAMS}
+        )
+
+
+def _parse_param(key, value):
+    """Parse the value of a policy param, e.g. from the command line."""
+
+    if key in BOOLEAN_PARAMS and isinstance(value, str):
+        if value.lower() in ("1", "true", "yes", "on"):
+            return True
+        if value.lower() in ("0", "false", "no", "off"):
+            return False
+    elif key in BOOLEAN_PARAMS:
+        return bool(value)
+    else:
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            pass
+
+    raise ValueError(f"Invalid value for param {key}: {value!r}")
+
+
+class TokenBucket:
+    """Token bucket that limits the number of requests per minute.
+
+    The bucket holds at most a second of requests (and at least one), such
+    that bursts stay small.
+
+    Arguments
+    ---------
+    rate: int
+        The number of requests per minute.
+    """
+
+    def __init__(self, rate):
+        self.rate = rate / 60
+        self.capacity = max(self.rate, 1)
+
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Take a token, wait for it if the bucket is empty."""
+
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.capacity, self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                wait = (1 - self._tokens) / self.rate
+
+            time.sleep(wait)
+
+
+class AIMDController:
+    """Adaptive concurrency limit of a host.
+
+    The limit grows additively (one more request per round of successful
+    requests) while the latency of the host stays low, which means the
+    throughput grows with the concurrency. The limit is cut
+    multiplicatively on failures (e.g. 429 or 5xx responses and
+    connection errors) and when the latency rises well above the lowest
+    latency seen, which means the requests queue up at the server.
+
+    Arguments
+    ---------
+    max_limit: int
+        The maximum number of concurrent requests.
+    initial: int
+        The number of concurrent requests to start with.
+    decrease: float
+        The factor to cut the limit with on failures.
+    latency_decrease: float
+        The factor to cut the limit with on rising latency.
+    latency_tolerance: float
+        The latency (relative to the lowest latency) that counts as rising.
+    """
+
+    def __init__(
+        self,
+        max_limit,
+        initial=2,
+        decrease=0.5,
+        latency_decrease=0.9,
+        latency_tolerance=2.0,
+    ):
+        self.max_limit = max_limit
+        self.limit = float(min(initial, max_limit))
+        self.decrease = decrease
+        self.latency_decrease = latency_decrease
+        self.latency_tolerance = latency_tolerance
+
+        self._active = 0
+        self._base_latency = None
+        self._latency = None
+        self._last_decrease = 0
+        self._condition = threading.Condition()
+
+    def acquire(self):
+        """Wait for a free slot below the limit."""
+
+        with self._condition:
+            while self._active >= int(self.limit):
+                self._condition.wait()
+            self._active += 1
+
+    def release(self):
+        with self._condition:
+            self._active -= 1
+            self._condition.notify_all()
+
+    def _decrease(self, factor):
+        # decrease once per round trip, the other requests of that round
+        # saw the same congestion
+        now = time.monotonic()
+        if now - self._last_decrease < (self._latency or 0):
+            return
+
+        self.limit = max(1.0, self.limit * factor)
+        self._last_decrease = now
+
+    def record_success(self, latency):
+        """Record the latency (seconds to the response) of a request."""
+
+        with self._condition:
+            if self._base_latency is None or latency < self._base_latency:
+                self._base_latency = latency
+            else:
+                # follow a slowly rising base latency of the server
+                self._base_latency += 0.01 * (latency - self._base_latency)
+
+            self._latency = (
+                latency
+                if self._latency is None
+                else 0.8 * self._latency + 0.2 * latency
+            )
+
+            if self._latency > self._base_latency * self.latency_tolerance:
+                self._decrease(self.latency_decrease)
+            else:
+                self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+                self._condition.notify_all()
+
+    def record_failure(self):
+        """Record a failed or throttled request."""
+
+        with self._condition:
+            self._decrease(self.decrease)
+
+
+class HostLimiter:
+    """The connection limit and rate limits of a single host."""
+
+    def __init__(
+        self, max_connections=None, api_rate=None, file_rate=None, adaptive=False
+    ):
+        self.controller = None
+        self._connections = None
+
+        if adaptive:
+            self.controller = AIMDController(
+                max_connections or DEFAULT_ADAPTIVE_MAX_CONNECTIONS
+            )
+        elif max_connections:
+            self._connections = threading.BoundedSemaphore(max_connections)
+        self._buckets = {
+            "api": TokenBucket(api_rate) if api_rate else None,
+            "file": TokenBucket(file_rate) if file_rate else None,
+        }
+
+    @contextmanager
+    def limit(self, endpoint="api"):
+        """Hold a connection to the host for a request to the endpoint.
+
+        Arguments
+        ---------
+        endpoint: str
+            The kind of endpoint, 'api' or 'file'.
+        """
+
+        slots = self.controller or self._connections
+        if slots is not None:
+            slots.acquire()
+
+        try:
+            if self._buckets[endpoint] is not None:
+                self._buckets[endpoint].acquire()
+
+            yield
+        finally:
+            if slots is not None:
+                slots.release()
+
+    def record_success(self, latency):
+        """Record the latency of a request to the host."""
+
+        if self.controller is not None:
+            self.controller.record_success(latency)
+
+    def record_failure(self):
+        """Record a failed or throttled request to the host."""
+
+        if self.controller is not None:
+            self.controller.record_failure()
+
+
+# limiters are shared by all datasets (and sessions) with the same policy
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+def get_host_limiter(host, policy):
+    """Get the shared limiter of a host (netloc) for a transfer policy."""
+
+    key = (
+        host,
+        policy.max_connections,
+        policy.api_rate,
+        policy.file_rate,
+        bool(policy.adaptive),
+    )
+
+    with _limiters_lock:
+        if key not in _limiters:
+            _limiters[key] = HostLimiter(
+                policy.max_connections,
+                policy.api_rate,
+                policy.file_rate,
+                adaptive=bool(policy.adaptive),
+            )
+
+        return _limiters[key]
@@ -0,0 +1,121 @@
+import json
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from datahugger.session import create_session
+from datahugger.session import get_cache_dir
+from datahugger.utils import get_re3data_repositories
+from datahugger.utils import get_re3data_repository
+
+# name of the publisher index (in the cache dir)
+RE3DATA_INDEX_NAME = "re3data_index.json"
+
+# the loaded publisher indexes by path, a missing index isn't stored such
+# that an index built later is found
+_re3data_indexes = {}
+
+
+def get_re3data_index_path(cache=True):
+    """Get the path of the local re3data publisher index."""
+
+    return get_cache_dir(cache) / RE3DATA_INDEX_NAME
+
+
+def _get_software(re3data_id, session):
+    try:
+        return get_re3data_repository(re3data_id, session=session).lower()
+    except Exception as err:
+        logging.info(f"No software found for re3data repository {re3data_id}: {err}")
+        return None
+
+
+def build_re3data_index(cache=True, max_workers=8):
+    """Build the local index of the publishers in re3data.
+
+    The index maps the lower-case name of each repository in re3data to
+    its re3data identifier and software (e.g. 'dataverse'), such that the
+    service of a DOI can be found with the publisher in DataCite only.
+
+    Arguments
+    ---------
+    cache: bool, str, pathlib.Path
+        The cache folder to store the index in, or True for the user
+        cache dir.
+    max_workers: int
+        The number of repositories to request concurrently.
+
+    Returns
+    -------
+    dict:
+        The publisher index.
+    """
+
+    repos = [repo for repo in get_re3data_repositories() if repo.get("name")]
+
+    session = create_session(max_workers)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        software = executor.map(lambda repo: _get_software(repo["id"], session), repos)
+
+        publishers = {
+            repo["name"].lower(): [repo["id"], s] for repo, s in zip(repos, software)
+        }
+
+    index = {"created": time.time(), "publishers": publishers}
+
+    path = get_re3data_index_path(cache)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(f"{path}.tmp", "w") as f:
+        json.dump(index, f)
+    os.replace(f"{path}.tmp", path)
+
+    _re3data_indexes.pop(path, None)
+
+    return index
+
+
+def _load_re3data_index(path):
+    if path not in _re3data_indexes:
+        try:
+            with open(path) as f:
+                _re3data_indexes[path] = json.load(f)["publishers"]
+        except (OSError, ValueError, KeyError):
+            return None
+
+    return _re3data_indexes[path]
+
+
+def get_publisher_software(publisher, cache=True):
+    """Get the software of a publisher from the local re3data index.
+
+    The index is loaded on first use.
+
+    Arguments
+    ---------
+    publisher: str
+        The name of the publisher (repository).
+    cache: bool, str, pathlib.Path
+        The cache folder of the index, or True for the user cache dir.
+
+    Returns
+    -------
+    str:
+        The lower-case name of the software, or None if the publisher
+        or its software is unknown.
+
+    Raises
+    ------
+    FileNotFoundError
+        If there is no (valid) index.
+    """
+
+    path = get_re3data_index_path(cache)
+    publishers = _load_re3data_index(path)
+
+    if publishers is None:
+        raise FileNotFoundError(f"No re3data index found at '{path}'")
+
+    entry = publishers.get(publisher.lower())
+
+    return entry[1] if entry else None
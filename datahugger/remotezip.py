@@ -0,0 +1,99 @@
+import io
+import re
+
+# number of bytes read ahead per range request
+BLOCK_SIZE = 256 * 1024
+
+
+class HTTPRangeFile(io.RawIOBase):
+    """Read-only, seekable file on a remote server.
+
+    Every read is served by an HTTP range request. Wrap the file in a
+    buffered reader (see `open_remote_file`) to read ahead and avoid a
+    request for every small read.
+
+    Arguments
+    ---------
+    url: str
+        The URL of the file.
+    session: requests.Session
+        The session to request the ranges with.
+
+    Raises
+    ------
+    OSError
+        If the server doesn't support range requests.
+    """
+
+    def __init__(self, url, session):
+        super().__init__()
+        self.session = session
+        self._pos = 0
+
+        # probe the server for range support and the size of the file
+        with session.get(url, headers={"Range": "bytes=0-0"}, stream=True) as r:
+            r.raise_for_status()
+            match = re.match(r"bytes 0-0/(\d+)", r.headers.get("content-range", ""))
+            if r.status_code != 206 or not match:
+                raise OSError(f"No support for range requests {url}")
+
+            # request the ranges from the redirected location
+            self.url = r.url
+            self.size = int(match.group(1))
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self._pos
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_SET:
+            self._pos = offset
+        elif whence == io.SEEK_CUR:
+            self._pos += offset
+        elif whence == io.SEEK_END:
+            self._pos = self.size + offset
+        else:
+            raise ValueError(f"Invalid whence ({whence})")
+
+        return self._pos
+
+    def readinto(self, b):
+        if self._pos >= self.size or len(b) == 0:
+            return 0
+
+        end = min(self._pos + len(b), self.size) - 1
+        r = self.session.get(self.url, headers={"Range": f"bytes={self._pos}-{end}"})
+        r.raise_for_status()
+        if r.status_code != 206:
+            raise OSError(f"Range request not honoured for {self.url}")
+
+        n = len(r.content)
+        b[:n] = r.content
+        self._pos += n
+        return n
+
+
+def open_remote_file(url, session, block_size=BLOCK_SIZE):
+    """Open a remote file for random access reads.
+
+    Arguments
+    ---------
+    url: str
+        The URL of the file.
+    session: requests.Session
+        The session to request the ranges with.
+    block_size: int
+        The minimal number of bytes per range request.
+
+    Returns
+    -------
+    io.BufferedReader:
+        The remote file.
+    """
+
+    return io.BufferedReader(HTTPRangeFile(url, session), buffer_size=block_size)
@@ -0,0 +1,123 @@
+import logging
+import sqlite3
+import time
+from contextlib import contextmanager
+
+from datahugger.exceptions import DOIError
+from datahugger.exceptions import RepositoryNotSupportedError
+from datahugger.session import get_cache_dir
+
+# name of the database with resolved identifiers (in the cache dir)
+RESOLVE_CACHE_NAME = "identifiers.sqlite"
+
+# number of seconds to keep resolved identifiers and failed resolutions
+DEFAULT_RESOLVE_TTL = 7 * 24 * 3600
+DEFAULT_RESOLVE_NEGATIVE_TTL = 3600
+
+# errors that are cached as the result of a failed resolution
+CACHED_ERRORS = {err.__name__: err for err in [DOIError, RepositoryNotSupportedError]}
+
+
+class ResolveCache:
+    """On-disk cache of resolved identifiers.
+
+    Maps identifiers (DOIs, Handles, URLs) to the resolved URL and the
+    name of the service. Identifiers that failed to resolve, because the
+    DOI doesn't exist or the repository isn't supported, are cached with
+    a shorter time to live.
+
+    Arguments
+    ---------
+    cache: bool, str, pathlib.Path
+        The cache folder, or True for the user cache dir.
+    ttl: int
+        The number of seconds to keep resolved identifiers.
+    negative_ttl: int
+        The number of seconds to keep failed resolutions.
+    """
+
+    def __init__(
+        self,
+        cache=True,
+        ttl=DEFAULT_RESOLVE_TTL,
+        negative_ttl=DEFAULT_RESOLVE_NEGATIVE_TTL,
+    ):
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+
+        cache_dir = get_cache_dir(cache)
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        self.path = cache_dir / RESOLVE_CACHE_NAME
+
+        with self._connect() as con:
+            con.execute(
+                "CREATE TABLE IF NOT EXISTS identifiers ("
+                "identifier TEXT PRIMARY KEY, url TEXT, service TEXT, "
+                "error TEXT, message TEXT, expires REAL)"
+            )
+
+    @contextmanager
+    def _connect(self):
+        con = sqlite3.connect(self.path, timeout=30)
+        try:
+            with con:
+                yield con
+        finally:
+            con.close()
+
+    def get(self, identifier):
+        """Get the resolution of an identifier.
+
+        Returns
+        -------
+        tuple:
+            The resolved URL and the name of the service, or None if the
+            identifier isn't cached or expired.
+
+        Raises
+        ------
+        DOIError, RepositoryNotSupportedError
+            If the cached resolution failed.
+        """
+
+        with self._connect() as con:
+            row = con.execute(
+                "SELECT url, service, error, message FROM identifiers "
+                "WHERE identifier = ? AND expires > ?",
+                (str(identifier), time.time()),
+            ).fetchone()
+
+        if row is None:
+            return None
+
+        url, service, error, message = row
+        logging.info(f"Resolution of {identifier} found in cache")
+
+        if error:
+            raise CACHED_ERRORS[error](message)
+
+        return url, service
+
+    def set(self, identifier, url=None, service=None, error=None):
+        """Store the resolution of an identifier, or the error."""
+
+        ttl = self.ttl if error is None else self.negative_ttl
+
+        with self._connect() as con:
+            con.execute(
+                "INSERT OR REPLACE INTO identifiers VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    str(identifier),
+                    url,
+                    service,
+                    error.__class__.__name__ if error is not None else None,
+                    str(error) if error is not None else None,
+                    time.time() + ttl,
+                ),
+            )
+
+    def clear(self):
+        """Remove all identifiers from the cache."""
+
+        with self._connect() as con:
+            con.execute("DELETE FROM identifiers")
@@ -1,25 +1,77 @@
 import logging
-import re
+from functools import partial
 from urllib.parse import urlparse
 
 import requests
 
+from datahugger.base import DatasetDownloader
 from datahugger.config import RE3DATA_SOFTWARE
-from datahugger.config import SERVICES_NETLOC
-from datahugger.config import SERVICES_NETLOC_REGEXP
+from datahugger.config import SERVICES_DOI_MATCHER
+from datahugger.config import SERVICES_HOST_MATCHER
+from datahugger.config import SERVICES_URL_MATCHER
 from datahugger.exceptions import RepositoryNotSupportedError
 from datahugger.handles import DOI
+from datahugger.re3data import get_publisher_software
+from datahugger.retry import RETRY_STATUS
 from datahugger.utils import _get_url
 from datahugger.utils import get_datapublisher_from_doi
 from datahugger.utils import get_re3data_repositories
 from datahugger.utils import get_re3data_repository
 
 
-def _resolve_service(resource):
+def _get_service_class(name):
+    """Find a subclass of DatasetDownloader by name."""
+
+    classes = [DatasetDownloader]
+    while classes:
+        cls = classes.pop()
+        if cls.__name__ == name:
+            return cls
+        classes.extend(cls.__subclasses__())
+
+    return None
+
+
+def _route_doi(doi):
+    """Get the service and the landing page of a DOI without resolving it.
+
+    Returns
+    -------
+    tuple:
+        The service class and the URL of the landing page, or None if the
+        DOI isn't in the routing table.
+    """
+
+    match = SERVICES_DOI_MATCHER.match_groups(doi.doi)
+    if match is None:
+        return None
+
+    (service, url, *normalize), groups = match
+    if normalize:
+        groups = {k: normalize[0](v) for k, v in groups.items()}
+
+    return service, url.format(doi=doi.doi, **groups)
+
+
+def _resolve_service(resource, session=None, cache=True):
+    """Find the service of a resource.
+
+    Arguments
+    ---------
+    resource: str, DOI, Handle
+        The resource identifier.
+    session: requests.Session
+        The session for the requests to DataCite and re3data.
+    cache: bool, str, pathlib.Path
+        The cache folder of the re3data index, or True for the user
+        cache dir.
+    """
+
     for resolver in [
+        _resolve_service_from_doi,
         _resolve_service_from_netloc,
         _resolve_service_from_url_pattern,
-        _resolve_service_with_re3data,
+        partial(_resolve_service_with_re3data, session=session, cache=cache),
     ]:
         service_class = resolver(resource)
 
@@ -30,6 +82,15 @@ def _resolve_service(resource):
     raise RepositoryNotSupportedError(f"Data protocol for {resource} not found.")
 
 
+def _resolve_service_from_doi(resource):
+    if not isinstance(resource, DOI):
+        return None
+
+    route = _route_doi(resource)
+    if route is not None:
+        return route[0]
+
+
 def _resolve_service_from_netloc(resource):
     uri = urlparse(_get_url(resource))
 
@@ -37,26 +98,25 @@ def _resolve_service_from_netloc(resource):
         return None
 
     logging.info(f"Resolve service for netloc '{uri.hostname}'")
-    if uri.hostname in SERVICES_NETLOC.keys():
-        return SERVICES_NETLOC[uri.hostname]
+    return SERVICES_HOST_MATCHER.match(uri.hostname)
 
 
 def _resolve_service_from_url_pattern(resource):
-    url = _get_url(resource)
-
-    for netloc_re, service in SERVICES_NETLOC_REGEXP.items():
-        if re.match(netloc_re, url):
-            return service
+    return SERVICES_URL_MATCHER.match(_get_url(resource))
 
 
-def _resolve_service_with_re3data(doi):
+def _resolve_service_with_re3data(doi, session=None, cache=True):
     if not isinstance(doi, DOI):
         return None
 
     logging.info("Resolve service with datacite and re3data")
     try:
-        publisher = get_datapublisher_from_doi(doi)
-    except requests.HTTPError:
+        publisher = get_datapublisher_from_doi(doi, session=session)
+    except requests.HTTPError as err:
+        # a transient error (after retries) doesn't mean that the service
+        # is unknown, don't report (and cache) it as unsupported
+        if err.response is None or err.response.status_code in RETRY_STATUS:
+            raise
         return None
     logging.info(f"Datacite publisher of dataset: {publisher}")
 
@@ -64,11 +124,18 @@ def _resolve_service_with_re3data(doi):
         logging.info("Can't resolve the publisher from the DOI.")
         return None
 
+    # the local publisher index replaces the requests to re3data
+    try:
+        software = get_publisher_software(publisher, cache=cache)
+        return RE3DATA_SOFTWARE.get(software) if software else None
+    except FileNotFoundError:
+        logging.info("No re3data index, run 'datahugger index' to build it.")
+
     data_repos = get_re3data_repositories()
 
     for repo in data_repos:
         if publisher.lower() == repo["name"].lower():
-            r_software = get_re3data_repository(repo["id"])
+            r_software = get_re3data_repository(repo["id"], session=session)
 
             try:
                 return RE3DATA_SOFTWARE[r_software.lower()]
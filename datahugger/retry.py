@@ -0,0 +1,288 @@
+import email.utils
+import logging
+import random
+import threading
+import time
+from urllib.parse import urlparse
+
+import requests
+
+# responses that are worth to retry
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+# errors of the connection or the transfer that are worth to retry
+RETRY_ERRORS = (
+    requests.ConnectionError,
+    requests.Timeout,
+    requests.exceptions.ChunkedEncodingError,
+)
+
+DEFAULT_MAX_RETRIES = 5
+DEFAULT_BACKOFF_FACTOR = 0.5
+DEFAULT_MAX_BACKOFF = 60
+DEFAULT_RETRY_BUDGET = 500
+DEFAULT_BREAKER_THRESHOLD = 5
+DEFAULT_BREAKER_PAUSE = 30
+
+
+class RetryStats:
+    """Number of retried and failed requests."""
+
+    def __init__(self):
+        self.retries = 0
+        self.failures = 0
+
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return (
+            f"{self.__class__.__name__}(retries={self.retries}, "
+            f"failures={self.failures})"
+        )
+
+    def add(self, retries=0, failures=0):
+        with self._lock:
+            self.retries += retries
+            self.failures += failures
+
+
+class CircuitBreaker:
+    """Pause the requests to a host after consecutive failures.
+
+    Arguments
+    ---------
+    threshold: int
+        The number of consecutive failures that opens the breaker.
+    pause: float
+        The number of seconds to pause the requests to the host.
+    """
+
+    def __init__(
+        self, threshold=DEFAULT_BREAKER_THRESHOLD, pause=DEFAULT_BREAKER_PAUSE
+    ):
+        self.threshold = threshold
+        self.pause = pause
+
+        self._failures = 0
+        self._open_until = 0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        """Wait until the breaker is closed."""
+
+        delay = self._open_until - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+
+            if self._failures >= self.threshold:
+                logging.warning(
+                    f"{self._failures} consecutive failures, pause for {self.pause}s"
+                )
+                self._open_until = time.monotonic() + self.pause
+                self._failures = 0
+
+
+def _parse_retry_after(value):
+    """Get the number of seconds of a Retry-After header, or None."""
+
+    if not value:
+        return None
+
+    try:
+        return max(float(value), 0)
+    except ValueError:
+        pass
+
+    try:
+        date = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+    return max(date.timestamp() - time.time(), 0)
+
+
+class Retrier:
+    """Retry failed requests with backoff.
+
+    Requests that fail with a connection error or a transient status
+    (429, 5xx) are retried with jittered exponential backoff, or after the
+    delay in the Retry-After header of the response. The retries of all
+    requests together are limited by a budget, and the requests to a host
+    are paused after consecutive failures (circuit breaker). Responses
+    with a Retry-After header don't count as failures of the breaker, the
+    server tells how long to wait.
+
+    Arguments
+    ---------
+    max_retries: int
+        The maximum number of retries of a request.
+    backoff_factor: float
+        The maximum delay of the first retry in seconds, doubled on each
+        retry.
+    max_backoff: float
+        The maximum delay of a retry in seconds, also for Retry-After.
+    budget: int
+        The maximum number of retries of all requests together.
+    breaker_threshold: int
+        The number of consecutive failures of a host that pauses the
+        requests to the host.
+    breaker_pause: float
+        The number of seconds to pause the requests to a failing host.
+    """
+
+    def __init__(
+        self,
+        max_retries=DEFAULT_MAX_RETRIES,
+        backoff_factor=DEFAULT_BACKOFF_FACTOR,
+        max_backoff=DEFAULT_MAX_BACKOFF,
+        budget=DEFAULT_RETRY_BUDGET,
+        breaker_threshold=DEFAULT_BREAKER_THRESHOLD,
+        breaker_pause=DEFAULT_BREAKER_PAUSE,
+    ):
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.budget = budget
+        self.breaker_threshold = breaker_threshold
+        self.breaker_pause = breaker_pause
+
+        self.stats = RetryStats()
+
+        self._breakers = {}
+        self._lock = threading.Lock()
+
+    def _get_breaker(self, host):
+        with self._lock:
+            if host not in self._breakers:
+                self._breakers[host] = CircuitBreaker(
+                    self.breaker_threshold, self.breaker_pause
+                )
+            return self._breakers[host]
+
+    def _take_budget(self):
+        with self._lock:
+            if self.budget <= 0:
+                return False
+            self.budget -= 1
+            return True
+
+    def get_delay(self, attempt, response=None):
+        """Get the delay before the retry of a failed attempt."""
+
+        if response is not None:
+            retry_after = _parse_retry_after(response.headers.get("retry-after"))
+            if retry_after is not None:
+                return min(retry_after, self.max_backoff)
+
+        # full jitter
+        return random.uniform(
+            0, min(self.max_backoff, self.backoff_factor * 2**attempt)
+        )
+
+    def call(self, fn, url, stats=None, retry_status=True):
+        """Call fn (a request to url) and retry it if it fails.
+
+        Arguments
+        ---------
+        fn: callable
+            The function that does the request, without arguments.
+        url: str
+            The URL of the request, to pause the requests to its host.
+        stats: RetryStats
+            Extra stats to count the retries and failures in, e.g. of
+            a dataset.
+        retry_status: bool
+            Retry responses (and HTTPErrors) with a transient status. If
+            False, only connection and transfer errors are retried.
+
+        Returns
+        -------
+        The return value of fn. If all retries failed, the last response
+        is returned or the last error is raised.
+        """
+
+        breaker = self._get_breaker(urlparse(url).hostname)
+        all_stats = [self.stats] if stats is None else [self.stats, stats]
+
+        attempt = 0
+        while True:
+            breaker.wait()
+
+            response = None
+            try:
+                response = fn()
+            except RETRY_ERRORS as err:
+                error = err
+            except requests.HTTPError as err:
+                if (
+                    not retry_status
+                    or err.response is None
+                    or err.response.status_code not in RETRY_STATUS
+                ):
+                    raise
+                response, error = err.response, err
+            else:
+                if not (
+                    retry_status
+                    and isinstance(response, requests.Response)
+                    and response.status_code in RETRY_STATUS
+                ):
+                    breaker.record_success()
+                    return response
+                error = None
+
+            # the server tells when to retry, don't pause the whole host
+            if response is None or (
+                _parse_retry_after(response.headers.get("retry-after")) is None
+            ):
+                breaker.record_failure()
+
+            if attempt >= self.max_retries or not self._take_budget():
+                for s in all_stats:
+                    s.add(failures=1)
+                if error is not None:
+                    raise error
+                return response
+
+            delay = self.get_delay(attempt, response)
+            if response is not None:
+                response.close()
+
+            logging.warning(
+                f"Request to {url} failed ({error or response.status_code}), "
+                f"retry in {delay:.1f}s"
+            )
+            for s in all_stats:
+                s.add(retries=1)
+
+            time.sleep(delay)
+            attempt += 1
+
+
+_retrier_lock = threading.Lock()
+
+
+def get_retrier(session):
+    """Get the retrier of a session, shared by all requests of the run."""
+
+    with _retrier_lock:
+        if getattr(session, "retrier", None) is None:
+            session.retrier = Retrier()
+
+        return session.retrier
+
+
+def request_with_retry(session, method, url, stats=None, **kwargs):
+    """Do a request with the session and retry it if it fails."""
+
+    return get_retrier(session).call(
+        lambda: session.request(method, url, **kwargs), url, stats=stats
+    )
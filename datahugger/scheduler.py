@@ -0,0 +1,141 @@
+import threading
+from collections import OrderedDict
+from collections import deque
+from concurrent.futures import Executor
+from concurrent.futures import Future
+from concurrent.futures import wait as wait_futures
+
+
+class FairExecutor:
+    """Thread pool that schedules the tasks of different keys round robin.
+
+    The tasks of each key (e.g. a dataset) are queued separately. The
+    workers take the next task of each key in turn, such that a key with
+    many tasks doesn't delay the tasks of the other keys.
+
+    Arguments
+    ---------
+    max_workers: int
+        The number of worker threads.
+    """
+
+    def __init__(self, max_workers):
+        self.max_workers = max(max_workers, 1)
+
+        self._queues = OrderedDict()
+        self._condition = threading.Condition()
+        self._threads = []
+        self._shutdown = False
+
+    def submit(self, key, fn, *args, **kwargs):
+        """Schedule fn(*args, **kwargs) in the queue of key."""
+
+        future = Future()
+
+        with self._condition:
+            if self._shutdown:
+                raise RuntimeError("Cannot schedule new tasks after shutdown")
+
+            self._queues.setdefault(key, deque()).append((future, fn, args, kwargs))
+            self._condition.notify()
+
+            if len(self._threads) < self.max_workers:
+                thread = threading.Thread(target=self._work, daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+        return future
+
+    def for_key(self, key):
+        """Get an executor that submits its tasks to the queue of key."""
+
+        return KeyedExecutor(self, key)
+
+    def _next_task(self):
+        with self._condition:
+            while not self._queues:
+                if self._shutdown:
+                    return None
+                self._condition.wait()
+
+            # take the first task of the first key and move the key to the end
+            key, queue = self._queues.popitem(last=False)
+            task = queue.popleft()
+            if queue:
+                self._queues[key] = queue
+
+            return task
+
+    def _work(self):
+        while True:
+            task = self._next_task()
+            if task is None:
+                return
+
+            future, fn, args, kwargs = task
+            if not future.set_running_or_notify_cancel():
+                continue
+
+            try:
+                result = fn(*args, **kwargs)
+            except BaseException as err:
+                future.set_exception(err)
+            else:
+                future.set_result(result)
+
+    def shutdown(self, wait=True):
+        """Stop the workers once all queued tasks are done."""
+
+        with self._condition:
+            self._shutdown = True
+            self._condition.notify_all()
+
+        if wait:
+            for thread in self._threads:
+                thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.shutdown(wait=True)
+        return False
+
+
+class KeyedExecutor(Executor):
+    """Executor for the tasks of a single key of a FairExecutor.
+
+    Shutting it down waits for (or cancels) the tasks of the key, but
+    doesn't stop the shared workers, such that it can be reused.
+    """
+
+    def __init__(self, executor, key):
+        self._executor = executor
+        self._key = key
+
+        self._futures = set()
+        self._lock = threading.Lock()
+
+    def submit(self, fn, /, *args, **kwargs):
+        future = self._executor.submit(self._key, fn, *args, **kwargs)
+
+        with self._lock:
+            self._futures.add(future)
+        future.add_done_callback(self._discard)
+
+        return future
+
+    def _discard(self, future):
+        with self._lock:
+            self._futures.discard(future)
+
+    def shutdown(self, wait=True, *, cancel_futures=False):
+        with self._lock:
+            futures = list(self._futures)
+
+        if cancel_futures:
+            for future in futures:
+                future.cancel()
+
+        if wait:
+            wait_futures(futures)
@@ -1,17 +1,17 @@
-import io
 import re
 import xml.etree.ElementTree as ET
-import zipfile
 from pathlib import Path
 from typing import Union
 from urllib.parse import quote
 from urllib.parse import urlparse
 
-import requests
 from jsonpath_ng.jsonpath import Fields
 from jsonpath_ng.jsonpath import Slice
 
 from datahugger.base import DatasetDownloader
+from datahugger.files import FileRecord
+from datahugger.policy import POLICY_PARAMS
+from datahugger.policy import TransferPolicy
 from datahugger.utils import _get_url
 
 
@@ -20,17 +20,11 @@ class ArXivDataset(DatasetDownloader):
 
     REGEXP_ID = r"https://arxiv\.org/abs/(?P<record_id>.*)"
 
-    @property
-    def files(self):
-        return [
-            {
-                "link": f"https://arxiv.org/pdf/{self._params['record_id']}.pdf",
-                "name": self._params["record_id"].split("/")[-1] + ".pdf",
-                "size": None,
-                "hash": None,
-                "hash_type": None,
-            }
-        ]
+    def _iter_files(self):
+        yield FileRecord(
+            link=f"https://arxiv.org/pdf/{self._params['record_id']}.pdf",
+            name=self._params["record_id"].split("/")[-1] + ".pdf",
+        )
 
 
 class DataverseDataset(DatasetDownloader):
@@ -38,6 +32,9 @@ class DataverseDataset(DatasetDownloader):
 
     REGEXP_ID = r"(?P<type>dataset|file)\.xhtml\?persistentId=(?P<record_id>.*)"
 
+    # files are proxied through the application server
+    TRANSFER_POLICY = TransferPolicy(max_connections=2, chunk_size=256 * 1024)
+
     # paths to file attributes
     ATTR_NAME_JSONPATH = "filename"
     ATTR_SIZE_JSONPATH = "filesize"
@@ -92,7 +89,7 @@ class DataDryadDataset(DatasetDownloader):
         doi_safe = quote(f"doi:{self._params['record_id']}", safe="")
         dataset_metadata_url = self.API_URL + "/datasets/" + doi_safe
 
-        res = requests.get(dataset_metadata_url)
+        res = self._request("GET", dataset_metadata_url, "api")
         res.raise_for_status()
         dataset_metadata = res.json()
 
@@ -112,35 +109,23 @@ class DataOneDataset(DatasetDownloader):
     # the base entry point of the REST API
     API_URL = "https://cn.dataone.org/cn/v2/object/"
 
-    @property
-    def files(self):
-        if hasattr(self, "_files"):
-            return self._files
-
+    def _iter_files(self):
         doi_safe = quote(f"doi:{self._params['record_id']}", safe="")
 
-        res = requests.get(self.API_URL + doi_safe)
+        res = self._request("GET", self.API_URL + doi_safe, "api")
         res.raise_for_status()
         meta_tree = ET.fromstring(res.content)
 
-        x = []
         for data_elem in meta_tree.find("dataset"):
             if data_elem.tag in ["otherEntity", "dataTable"]:
-                x.append(
-                    {
-                        "link": data_elem.find(
-                            "./physical/distribution/online/url[@function='download']"
-                        ).text,
-                        "name": data_elem.find("entityName").text,
-                        "size": data_elem.find("./physical/size").text,
-                        "hash": None,
-                        "hash_type": None,
-                    }
+                yield FileRecord(
+                    link=data_elem.find(
+                        "./physical/distribution/online/url[@function='download']"
+                    ).text,
+                    name=data_elem.find("entityName").text,
+                    size=int(data_elem.find("./physical/size").text),
                 )
 
-        self._files = x
-        return self._files
-
 
 class PangaeaDataset(DatasetDownloader):
     """Downloader for PangaeaDataset repository."""
@@ -150,11 +135,12 @@ class PangaeaDataset(DatasetDownloader):
     # the base entry point of the REST API
     API_URL = "https://doi.pangaea.de/"
 
-    @property
-    def files(self):
+    def _iter_files(self):
         # get the difference between collection and file
-        r = requests.get(
-            f"{self.API_URL}{self._params['record_id']}?format=metadata_jsonld"
+        r = self._request(
+            "GET",
+            f"{self.API_URL}{self._params['record_id']}?format=metadata_jsonld",
+            "api",
         )
         r.raise_for_status()
         dists = r.json()["distribution"]
@@ -162,24 +148,16 @@ class PangaeaDataset(DatasetDownloader):
         if isinstance(dists, dict):
             dists = [dists]
 
-        files = []
         for d in dists:
             if d["encodingFormat"] in ["text/tab-separated-values", "application/zip"]:
-                r_filename = requests.head(d["contentUrl"])
+                r_filename = self._request("HEAD", d["contentUrl"], "file")
                 content_d = r_filename.headers["content-disposition"]
 
-                files.append(
-                    {
-                        "link": d["contentUrl"],
-                        "name": re.findall("filename=(.+)", content_d)[0],
-                        "size": None,
-                        "hash": None,
-                        "hash_type": None,
-                    }
+                yield FileRecord(
+                    link=d["contentUrl"],
+                    name=re.findall("filename=(.+)", content_d)[0],
                 )
 
-        return files
-
 
 class DSpaceDataset(DatasetDownloader):
     """Downloader for DSpaceDataset repositories."""
@@ -205,7 +183,7 @@ class DSpaceDataset(DatasetDownloader):
         base_url = uri.scheme + "://" + uri.netloc
 
         handle_id_url = f"{base_url}/rest/handle/{self._params['record_id']}"
-        res = requests.get(handle_id_url)
+        res = self._request("GET", handle_id_url, "api")
         res.raise_for_status()
 
         return base_url + res.json()["link"] + "/bitstreams"
@@ -219,6 +197,10 @@ class FigShareDataset(DatasetDownloader):
     # the base entry point of the REST API
     API_URL = "https://api.figshare.com/v2"
 
+    # files are served from S3, which handles large chunks (and ranges) well,
+    # segments aren't the default as they can't resume (use -p segments=4)
+    TRANSFER_POLICY = TransferPolicy(chunk_size=1024 * 1024)
+
     # the files and metadata about the dataset
     META_FILES_JSONPATH = "files[*]"
 
@@ -247,6 +229,8 @@ class DjehutyDataset(FigShareDataset):
     # the base entry point of the REST API
     API_URL = "https://data.4tu.nl/v2"
 
+    TRANSFER_POLICY = TransferPolicy()
+
 
 class GitHubDataset(DatasetDownloader):
     """Downloader for GitHub repository."""
@@ -255,14 +239,12 @@ class GitHubDataset(DatasetDownloader):
     REGEXP_ID = r"github\.com\/(?P<record_id>[a-zA-Z0-9]+\/[a-zA-Z0-9]+)[\/]*.*"
 
     def _get(self, output_folder: Union[Path, str], *args, **kwargs):
-        res = requests.get(
+        with self._download_to_tempfile(
             f"{self.API_URL}{self._params['record_id']}/archive/refs/heads/master.zip"
-        )
-        z = zipfile.ZipFile(io.BytesIO(res.content))
-        z.extractall(output_folder)
+        ) as fp:
+            self._extract_zip(fp, output_folder, flatten=False)
 
-    @property
-    def files(self):
+    def _iter_files(self):
         # at the moment, .files is not available for GitHub
         raise NotImplementedError("'files' is not available for GitHub")
 
@@ -284,11 +266,12 @@ class HuggingFaceDataset(DatasetDownloader):
                 " or use 'pip install datahugger[all]'"
             ) from err
 
-        params = self.params if self.params else {}
+        params = {
+            k: v for k, v in (self.params or {}).items() if k not in POLICY_PARAMS
+        }
         load_dataset(self._params["record_id"], cache_dir=output_folder, **params)
 
-    @property
-    def files(self):
+    def _iter_files(self):
         # at the moment, .files is not available for HuggingFace
         raise NotImplementedError("'files' is not available for HuggingFace")
 
@@ -325,6 +308,9 @@ class OSFDataset(DatasetDownloader):
     # the base entry point of the REST API
     API_URL = "https://api.osf.io/v2/nodes/"
 
+    # the API is rate limited, crawling large projects hits it quickly
+    TRANSFER_POLICY = TransferPolicy(max_connections=4, api_rate=100)
+
     # the files and metadata about the dataset
     API_URL_META = "{api_url}{record_id}/files/"
     META_FILES_JSONPATH = "data[*]"
@@ -345,21 +331,19 @@ class OSFDataset(DatasetDownloader):
     def _get_node_providers(self):
         """Get the providers of a node."""
         record_id = self._params["record_id"]
-        res = requests.get(f"{self.API_URL}/{record_id}/files/")
+        res = self._request("GET", f"{self.API_URL}/{record_id}/files/", "api")
         return set([prov["attributes"]["provider"] for prov in res.json()["data"]])
 
-    def _get_files_recursive(self, url, folder_name=None, base_url=None):
-        files = []
+    def _iter_files_recursive(self, url, folder_name=None, base_url=None):
         # In case of the top-level folder, we need to get first the providers
         if folder_name is None:
-            for provider in self._get_node_providers():
-                # and then the files of each provider
-                files.extend(
-                    super()._get_files_recursive(f"{url}{provider}/", None, base_url)
-                )
+            # and then the files of all providers at once
+            folders = [
+                (f"{url}{provider}/", None) for provider in self._get_node_providers()
+            ]
+            yield from self._iter_listing(folders, base_url=base_url)
         else:
-            files = super()._get_files_recursive(url, folder_name, base_url)
-        return files
+            yield from super()._iter_files_recursive(url, folder_name, base_url)
 
 
 class ZenodoDataset(DatasetDownloader):
@@ -373,6 +357,9 @@ class ZenodoDataset(DatasetDownloader):
     # the base entry point of the REST API
     API_URL = "https://zenodo.org/api/"
 
+    # rate limits of Zenodo for guests
+    TRANSFER_POLICY = TransferPolicy(max_connections=4, api_rate=60, file_rate=60)
+
     # the files and metadata about the dataset
     API_URL_META = "{api_url}records/{record_id}"
     META_FILES_JSONPATH = "files[*]"
@@ -0,0 +1,231 @@
+import logging
+import threading
+import time
+from datetime import timedelta
+from pathlib import Path
+
+import platformdirs
+import requests
+import requests_cache
+from requests.adapters import HTTPAdapter
+
+# default (connect, read) timeout in seconds
+DEFAULT_TIMEOUT = (10, 60)
+
+# default number of connections kept alive per host
+DEFAULT_POOL_MAXSIZE = 10
+
+# name of the on-disk cache of metadata requests (in the cache dir)
+CACHE_NAME = "metadata"
+
+# cached responses are served without a request for this number of seconds,
+# expired responses are revalidated with a conditional request
+DEFAULT_CACHE_EXPIRE_AFTER = 3600
+
+# cached responses older than this or beyond the size (bytes) are evicted
+DEFAULT_CACHE_MAX_AGE = timedelta(days=30)
+DEFAULT_CACHE_MAX_SIZE = 256 * 1024 * 1024
+
+# the cache is evicted at most once per this number of seconds, the time of
+# the last eviction is the modification time of the marker file
+DEFAULT_CACHE_EVICT_INTERVAL = 24 * 3600
+CACHE_EVICT_MARKER = "metadata.evicted"
+
+_default_session = None
+_default_session_lock = threading.Lock()
+
+
+class PooledSession(requests.Session):
+    """Session with keep-alive connection pools and default timeouts.
+
+    Arguments
+    ---------
+    pool_maxsize: int
+        The number of connections to keep alive per host. Match this with
+        the number of concurrent downloads.
+    timeout: float, tuple
+        The default (connect, read) timeout for requests without an
+        explicit timeout.
+    """
+
+    def __init__(self, pool_maxsize=DEFAULT_POOL_MAXSIZE, timeout=DEFAULT_TIMEOUT):
+        super().__init__()
+        self._configure(pool_maxsize, timeout)
+
+    def _configure(self, pool_maxsize, timeout):
+        self.timeout = timeout
+
+        adapter = HTTPAdapter(pool_maxsize=pool_maxsize)
+        self.mount("https://", adapter)
+        self.mount("http://", adapter)
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault("timeout", self.timeout)
+        return super().request(method, url, **kwargs)
+
+
+class CachedPooledSession(requests_cache.CacheMixin, PooledSession):
+    """Pooled session with an on-disk cache for metadata requests.
+
+    Responses of the API (listings, metadata) are cached. Streamed and
+    range requests, used for the file downloads, bypass the cache.
+    """
+
+    def __init__(
+        self,
+        cache_name=CACHE_NAME,
+        pool_maxsize=DEFAULT_POOL_MAXSIZE,
+        timeout=DEFAULT_TIMEOUT,
+        **kwargs,
+    ):
+        # the options of the cache and the pool are separated, as the
+        # cache backend accepts a timeout too
+        super().__init__(cache_name, **kwargs)
+        self._configure(pool_maxsize, timeout)
+
+    def request(self, method, url, *args, **kwargs):
+        if kwargs.get("stream") or "Range" in (kwargs.get("headers") or {}):
+            kwargs["expire_after"] = requests_cache.DO_NOT_CACHE
+
+        return super().request(method, url, *args, **kwargs)
+
+
+def get_cache_dir(cache=True):
+    """Get the folder of the on-disk caches.
+
+    Arguments
+    ---------
+    cache: bool, str, pathlib.Path
+        The folder, or True for the datahugger folder in the user cache
+        dir.
+
+    Returns
+    -------
+    pathlib.Path:
+        The cache folder.
+    """
+
+    if cache is True:
+        return Path(platformdirs.user_cache_dir("datahugger"))
+
+    return Path(cache)
+
+
+def evict_cache(
+    session, max_age=DEFAULT_CACHE_MAX_AGE, max_size=DEFAULT_CACHE_MAX_SIZE
+):
+    """Evict old responses from the cache of a session.
+
+    Responses older than max_age are removed first. If the cache is still
+    larger than max_size, the least recently stored responses are
+    removed.
+
+    Arguments
+    ---------
+    session: datahugger.session.CachedPooledSession
+        The session with a filesystem cache.
+    max_age: int, datetime.timedelta
+        The maximum age of a response (seconds).
+    max_size: int
+        The maximum size of the cache in bytes.
+    """
+
+    if max_age is not None:
+        session.cache.delete(older_than=max_age)
+
+    responses = session.cache.responses
+    if max_size is None or responses.size() <= max_size:
+        return
+
+    size = 0
+    evict = []
+    for path in sorted(
+        responses.paths(), key=lambda p: p.stat().st_mtime, reverse=True
+    ):
+        size += path.stat().st_size
+        if size > max_size:
+            evict.append(path.stem)
+
+    logging.info(f"Evict {len(evict)} responses from the cache")
+    responses.bulk_delete(evict)
+
+
+def _evict_cache_periodically(
+    session, cache_dir, interval=DEFAULT_CACHE_EVICT_INTERVAL
+):
+    """Evict the cache if it wasn't evicted in the last interval (seconds).
+
+    Evicting walks the whole cache, which is too slow to do for every
+    session.
+    """
+
+    marker = Path(cache_dir, CACHE_EVICT_MARKER)
+
+    try:
+        if time.time() - marker.stat().st_mtime < interval:
+            return
+    except OSError:
+        pass
+
+    # mark before evicting, such that concurrent sessions don't evict too
+    marker.parent.mkdir(parents=True, exist_ok=True)
+    marker.touch()
+
+    evict_cache(session)
+
+
+def create_session(max_workers=1, timeout=DEFAULT_TIMEOUT, cache=False):
+    """Create a session with a connection pool sized for the workers.
+
+    Arguments
+    ---------
+    max_workers: int
+        The maximum number of concurrent requests.
+    timeout: float, tuple
+        The default (connect, read) timeout in seconds.
+    cache: bool, str, pathlib.Path
+        Cache the responses of metadata requests on disk, in the user
+        cache dir (True) or in the given folder. Cached responses are
+        used for DEFAULT_CACHE_EXPIRE_AFTER seconds and revalidated with
+        conditional requests (ETag, Last-Modified) afterwards. Old
+        responses are evicted once per DEFAULT_CACHE_EVICT_INTERVAL
+        seconds. Default: False.
+
+    Returns
+    -------
+    datahugger.session.PooledSession
+        The session.
+    """
+
+    pool_maxsize = max(max_workers, DEFAULT_POOL_MAXSIZE)
+
+    if not cache:
+        return PooledSession(pool_maxsize=pool_maxsize, timeout=timeout)
+
+    cache_dir = get_cache_dir(cache)
+    session = CachedPooledSession(
+        cache_dir / CACHE_NAME,
+        backend="filesystem",
+        expire_after=DEFAULT_CACHE_EXPIRE_AFTER,
+        allowable_methods=("GET",),
+        pool_maxsize=pool_maxsize,
+        timeout=timeout,
+    )
+    _evict_cache_periodically(session, cache_dir)
+
+    return session
+
+
+def get_session(session=None):
+    """Return the given session or the shared default session."""
+
+    global _default_session
+
+    if session is not None:
+        return session
+
+    with _default_session_lock:
+        if _default_session is None:
+            _default_session = create_session()
+
+    return _default_session
@@ -1,11 +1,14 @@
+import hashlib
 import re
 import xml.etree.ElementTree as ET
 from pathlib import Path
 from urllib.parse import urlparse
 
-import requests
 import requests_cache
 
+from datahugger.retry import request_with_retry
+from datahugger.session import get_session
+
 
 def _is_url(s: str) -> bool:
     """Check if the string is a URL.
@@ -43,6 +46,37 @@ def _format_filename(s, len_s=35) -> str:
     return s[0 : (len_s - (len_suffixes + 5))] + "[...]" + "".join(Path(s).suffixes)
 
 
+def _is_hash_type(hash_type) -> bool:
+    """Check if the hash type is supported by hashlib."""
+
+    return isinstance(hash_type, str) and hash_type in hashlib.algorithms_available
+
+
+def _hash_file(fp, hash_type, chunk_size=1024 * 1024) -> str:
+    """Compute the hash of a file without loading it into memory.
+
+    Arguments
+    ---------
+    fp: str, pathlib.Path
+        The path to the file.
+    hash_type: str
+        The name of the hash algorithm, e.g. md5 or sha256.
+    chunk_size: int
+        The number of bytes to read at once.
+
+    Returns
+    -------
+    str:
+        The hexadecimal digest of the file."""
+
+    h = hashlib.new(hash_type)
+    with open(fp, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+
+    return h.hexdigest()
+
+
 def get_id_from_url(regexp, url):
     match = re.search(regexp, url)
 
@@ -50,13 +84,15 @@ def get_id_from_url(regexp, url):
         return match.group(1)
 
 
-def get_datapublisher_from_doi(doi):
+def get_datapublisher_from_doi(doi, session=None):
     """Get the publisher from the DOI.
 
     Arguments
     ---------
     doi: str
         The DOI to find the publisher for.
+    session: requests.Session
+        The session to use for the request. Default: shared session.
 
     Returns
     -------
@@ -65,7 +101,9 @@ def get_datapublisher_from_doi(doi):
 
     """
 
-    r = requests.get(f"https://api.datacite.org/dois/{doi}")
+    r = request_with_retry(
+        get_session(session), "GET", f"https://api.datacite.org/dois/{doi}"
+    )
     r.raise_for_status()
 
     record = r.json()
@@ -92,9 +130,11 @@ def get_re3data_repositories(
         yield {elem.tag: elem.text for elem in node if not elem.tag == "link"}
 
 
-def get_re3data_repository(re3data_id):
+def get_re3data_repository(re3data_id, session=None):
     namespaces = {"r3d": "http://www.re3data.org/schema/2-2"}
-    r = requests.get(f"https://www.re3data.org/api/v1/repository/{re3data_id}")
+    r = get_session(session).get(
+        f"https://www.re3data.org/api/v1/repository/{re3data_id}"
+    )
     r.raise_for_status()
 
     tree = ET.fromstring(r.content)
@@ -0,0 +1,68 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from datahugger.utils import _hash_file
+from datahugger.utils import _is_hash_type
+
+
+def _hash_job(job):
+    fp, hash_type = job
+    return _hash_file(fp, hash_type)
+
+
+def verify_checksums(output_folder, files_info, max_workers=None, skip=None):
+    """Verify the checksums of the downloaded files of a dataset.
+
+    The files are matched on their path relative to the output folder and
+    hashed in chunks across a pool of threads. Hashing releases the GIL on
+    the chunks, and unlike processes, threads are safe to start while the
+    download threads are running. Files without a (supported) hash in the
+    listing or missing from the output folder are ignored.
+
+    Arguments
+    ---------
+    output_folder: str, pathlib.Path
+        The folder with the downloaded files.
+    files_info: list
+        The listing of the files of the dataset.
+    max_workers: int
+        The number of threads to hash with. Default: number of CPUs.
+    skip: iterable
+        Relative paths of files that don't need to be verified, for
+        example because they are verified during the download.
+
+    Returns
+    -------
+    dict:
+        The relative path of each verified file and whether its
+        checksum matches.
+    """
+
+    skip = {os.path.normpath(name) for name in skip or []}
+
+    # index the listing by relative path
+    index = {}
+    for f in files_info:
+        name = os.path.normpath(f["name"])
+        if (
+            name not in skip
+            and f["hash"] is not None
+            and _is_hash_type(f["hash_type"])
+            and Path(output_folder, name).is_file()
+        ):
+            index[name] = f
+
+    jobs = [(Path(output_folder, name), f["hash_type"]) for name, f in index.items()]
+
+    if max_workers == 1 or len(jobs) <= 1:
+        hashes = map(_hash_job, jobs)
+    else:
+        max_workers = min(max_workers or os.cpu_count() or 1, len(jobs))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            hashes = list(executor.map(_hash_job, jobs))
+
+    return {
+        name: local_hash == str(f["hash"]).lower()
+        for (name, f), local_hash in zip(index.items(), hashes)
+    }
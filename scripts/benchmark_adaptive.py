@@ -0,0 +1,108 @@
+"""Benchmark the adaptive concurrency against a throttling repository.
+
+Downloads a record from a local mock repository that serves a limited
+number of concurrent requests and throttles (429) the others. Compares a
+fixed number of connections far above the capacity, the adaptive
+concurrency (AIMD) with the same number of workers, and a fixed number of
+connections that equals the capacity (the best possible setting).
+
+    python scripts/benchmark_adaptive.py --capacity 8 --workers 32
+"""
+
+import argparse
+import statistics
+import tempfile
+import threading
+import time
+
+from benchmark_download import MockDataset
+from mock_server import MockRepository
+
+from datahugger.policy import get_host_limiter
+
+
+def _sample_limit(dataset, url, samples, done):
+    controller = get_host_limiter(url.split("/")[2], dataset.policy).controller
+    while not done.wait(0.05):
+        samples.append(controller.limit)
+
+
+def run_once(args, max_workers, adaptive):
+    # a new server (and port) per run, limiters and breakers are per host
+    with MockRepository(
+        args.n_files, args.file_size, args.latency, capacity=args.capacity
+    ) as repo:
+        url = f"{repo.url}/records/1"
+        dataset = MockDataset(
+            url,
+            progress=False,
+            max_workers=max_workers,
+            params={"adaptive": 1} if adaptive else None,
+        )
+        # list the files beforehand, only the downloads are measured
+        n_files = len(dataset.files)
+
+        samples = []
+        done = threading.Event()
+        if adaptive:
+            sampler = threading.Thread(
+                target=_sample_limit, args=(dataset, url, samples, done)
+            )
+            sampler.start()
+
+        with tempfile.TemporaryDirectory() as output_folder:
+            start = time.perf_counter()
+            try:
+                result = dataset.download(output_folder)
+                error = None
+            except Exception as err:
+                result, error = None, err
+            elapsed = time.perf_counter() - start
+
+        done.set()
+        if adaptive:
+            sampler.join()
+
+        return {
+            "elapsed": elapsed,
+            "files/s": n_files / elapsed,
+            "retries": dataset.retry_stats.retries,
+            "failed": dataset.retry_stats.failures,
+            "throttled": repo.server.n_throttled,
+            "peak": repo.server.peak,
+            "limit": statistics.mean(samples[len(samples) // 2 :]) if samples else None,
+            "error": error if result is None else None,
+        }
+
+
+def run(args):
+    print(
+        f"{'run':<16} {'seconds':>8} {'files/s':>8} {'retries':>8} {'failed':>8} "
+        f"{'429s':>6} {'peak':>6} {'limit':>6}"
+    )
+
+    for name, max_workers, adaptive in [
+        (f"fixed {args.workers}", args.workers, False),
+        (f"adaptive {args.workers}", args.workers, True),
+        (f"fixed {args.capacity}", args.capacity, False),
+    ]:
+        r = run_once(args, max_workers, adaptive)
+        limit = "-" if r["limit"] is None else f"{r['limit']:.1f}"
+        print(
+            f"{name:<16} {r['elapsed']:>8.2f} {r['files/s']:>8.1f} "
+            f"{r['retries']:>8} {r['failed']:>8} "
+            f"{r['throttled']:>6} {r['peak']:>6} {limit:>6}"
+        )
+        if r["error"] is not None:
+            print(f"  failed: {r['error']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--n-files", type=int, default=400)
+    parser.add_argument("--file-size", type=int, default=16 * 1024)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--capacity", type=int, default=8)
+    parser.add_argument("--workers", type=int, default=32)
+
+    run(parser.parse_args())
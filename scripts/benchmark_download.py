@@ -0,0 +1,63 @@
+"""Benchmark the throughput of the download engine.
+
+Downloads a record with many small files from a local mock repository
+with an increasing number of workers.
+
+    python scripts/benchmark_download.py --n-files 200 --latency 0.05
+"""
+
+import argparse
+import tempfile
+import time
+
+from mock_server import MockRepository
+
+from datahugger.base import DatasetDownloader
+
+
+class MockDataset(DatasetDownloader):
+    """Downloader for the mock repository."""
+
+    REGEXP_ID = r"records/(?P<record_id>\d+)"
+
+    API_URL_META = "{base_url}/records/{record_id}"
+    META_FILES_JSONPATH = "files[*]"
+
+    ATTR_NAME_JSONPATH = "name"
+    ATTR_FILE_LINK_JSONPATH = "link"
+    ATTR_SIZE_JSONPATH = "size"
+
+
+def run(args):
+    with MockRepository(args.n_files, args.file_size, args.latency) as repo:
+        print(f"{'workers':>8} {'seconds':>8} {'files/s':>8} {'speedup':>8}")
+
+        baseline = None
+        for max_workers in args.workers:
+            dataset = MockDataset(
+                f"{repo.url}/records/1", progress=False, max_workers=max_workers
+            )
+
+            # list the files beforehand, only the downloads are measured
+            n_files = len(dataset.files)
+
+            with tempfile.TemporaryDirectory() as output_folder:
+                start = time.perf_counter()
+                dataset.download(output_folder)
+                elapsed = time.perf_counter() - start
+
+            baseline = baseline or elapsed
+            print(
+                f"{max_workers:>8} {elapsed:>8.2f} "
+                f"{n_files / elapsed:>8.1f} {baseline / elapsed:>8.1f}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--n-files", type=int, default=200)
+    parser.add_argument("--file-size", type=int, default=16 * 1024)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+
+    run(parser.parse_args())
@@ -0,0 +1,70 @@
+"""Benchmark the memory usage and filter speed of file listings.
+
+Compares a list of dicts (the previous representation) with the FileList
+of FileRecord dicts, on a synthetic listing.
+
+    python scripts/benchmark_files.py --n-files 500000
+"""
+
+import argparse
+import fnmatch
+import gc
+import time
+import tracemalloc
+
+from datahugger.files import FileList
+from datahugger.files import FileRecord
+
+
+def create_listing(n_files):
+    for i in range(n_files):
+        yield {
+            "link": f"https://example.org/api/files/{i}/download",
+            "name": f"folder_{i % 100}/file_{i}.{'csv' if i % 2 else 'txt'}",
+            "size": i * 10,
+            "hash": f"{i:032x}",
+            "hash_type": "md5",
+        }
+
+
+def list_of_dicts(listing):
+    return list(listing)
+
+
+def file_list(listing):
+    return FileList(FileRecord(**f) for f in listing)
+
+
+def filter_files(files):
+    if isinstance(files, FileList):
+        return files.filter(max_size=1000000, pattern="*.csv").total_size
+
+    return sum(
+        f["size"]
+        for f in files
+        if f["size"] <= 1000000 and fnmatch.fnmatch(f["name"], "*.csv")
+    )
+
+
+def run(args):
+    print(f"{'representation':>16} {'memory (MB)':>12} {'filter (s)':>11}")
+    for build in [list_of_dicts, file_list]:
+        gc.collect()
+        tracemalloc.start()
+        files = build(create_listing(args.n_files))
+        memory = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+
+        start = time.perf_counter()
+        filter_files(files)
+        elapsed = time.perf_counter() - start
+
+        print(f"{build.__name__:>16} {memory / 1e6:>12.1f} {elapsed:>11.3f}")
+        del files
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--n-files", type=int, default=500000)
+
+    run(parser.parse_args())
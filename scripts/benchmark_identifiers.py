@@ -0,0 +1,108 @@
+"""Benchmark the classification of resource identifiers.
+
+Classifies the identifiers (DOIs) and URLs of the benchmark datasets,
+repeated to the given number of inputs. Compares the previous approach
+(parsing each identifier type in turn, with exceptions for control flow
+and uncompiled patterns) with the single-pass parse_identifier.
+
+    python scripts/benchmark_identifiers.py --n 1000000
+"""
+
+import argparse
+import csv
+import itertools
+import re
+import time
+from pathlib import Path
+
+from datahugger.api import parse_many
+from datahugger.handles import parse_identifier
+from datahugger.utils import _is_url
+
+BENCHMARK_FILE = Path("benchmark", "benchmark_datasets.csv")
+
+
+def _parse_doi(s):
+    if s.startswith("doi:"):
+        s = s[4:]
+    if _is_url(s) and "doi.org" in s:
+        s = s.split("doi.org/")[1]
+    match = re.match(r"^10.\d{4,9}/[-._;()/:A-Z0-9]+$", s, re.IGNORECASE)
+    if match is None:
+        raise ValueError("Not a valid DOI")
+    return match.group()
+
+
+def _parse_handle(s):
+    if s.startswith("hdl:"):
+        s = s[4:]
+    match = re.match(r"^https\:\/\/hdl\.handle\.net\/(.*)$", s, re.IGNORECASE)
+    if match is None:
+        raise ValueError("Not a valid Handle")
+    return match.group()
+
+
+def _parse_arxiv(s):
+    match = re.match(
+        r".*(arxiv\.org/abs/|arXiv:)(\d{4}.\d{4,5}|[a-z\-]+(\.[A-Z]{2})?\/\d{7})(v\d+)?$",
+        s,
+        re.IGNORECASE,
+    )
+    if match is None:
+        raise ValueError("Not a valid arXiv identifier")
+    return match.group(2)
+
+
+def classify_sequential(identifiers):
+    result = []
+    for s in identifiers:
+        for kind, parse in [
+            ("doi", _parse_doi),
+            ("handle", _parse_handle),
+            ("arxiv", _parse_arxiv),
+        ]:
+            try:
+                result.append((kind, parse(s)))
+                break
+            except ValueError:
+                pass
+        else:
+            result.append(("url", s) if _is_url(s) else None)
+    return result
+
+
+def classify_single_pass(identifiers):
+    result = []
+    for s in identifiers:
+        try:
+            result.append(parse_identifier(s))
+        except ValueError:
+            result.append(None)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    with open(BENCHMARK_FILE) as f:
+        rows = list(csv.DictReader(f))
+
+    # the DOIs and landing page URLs of the datasets
+    sample = [r["id"] for r in rows] + [r["url"] for r in rows]
+    identifiers = list(itertools.islice(itertools.cycle(sample), args.n))
+
+    for name, fn in [
+        ("sequential", classify_sequential),
+        ("single pass", classify_single_pass),
+        ("parse_many", parse_many),
+    ]:
+        t0 = time.perf_counter()
+        fn(identifiers)
+        t = time.perf_counter() - t0
+        print(f"{name:<12} {t:6.2f}s {t / len(identifiers) * 1e6:6.2f}us/identifier")
+
+
+if __name__ == "__main__":
+    main()
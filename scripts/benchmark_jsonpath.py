@@ -0,0 +1,95 @@
+"""Benchmark the extraction of file attributes from a listing.
+
+Compares parsing the JSONPath expressions on every lookup (the previous
+implementation) with the compiled expressions and the fast path for
+dotted paths, on a synthetic OSF-style listing.
+
+    python scripts/benchmark_jsonpath.py --n-records 100000
+"""
+
+import argparse
+import time
+
+from jsonpath_ng.ext import parse
+
+from datahugger.services import OSFDataset
+
+
+class StaticResponse:
+    status_code = 200
+    ok = True
+
+    def __init__(self, data):
+        self.data = data
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.data
+
+
+class StaticSession:
+    """Session that returns the same listing for every request."""
+
+    def __init__(self, data):
+        self.data = data
+
+    def request(self, method, url, **kwargs):
+        return StaticResponse(self.data)
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+
+class UncachedOSFDataset(OSFDataset):
+    """OSF downloader that parses the expressions on every lookup."""
+
+    def _get_attr_attr(self, record, jsonp):
+        try:
+            return parse(jsonp).find(record)[0].value
+        except Exception:
+            return None
+
+
+def create_listing(n_records):
+    return {
+        "data": [
+            {
+                "attributes": {
+                    "kind": "file",
+                    "name": f"file_{i}.csv",
+                    "size": i,
+                    "extra": {"hashes": {"sha256": f"{i:064x}"}},
+                },
+                "links": {"download": f"https://osf.io/download/{i}/"},
+            }
+            for i in range(n_records)
+        ],
+        "links": {"next": None},
+    }
+
+
+def run(args):
+    listing = create_listing(args.n_records)
+
+    print(f"{'implementation':>18} {'seconds':>8} {'records/s':>10}")
+    for dataset_class in [UncachedOSFDataset, OSFDataset]:
+        dataset = dataset_class("https://osf.io/abcde/", session=StaticSession(listing))
+
+        start = time.perf_counter()
+        files = list(super(OSFDataset, dataset)._iter_files_recursive("https://osf.io"))
+        elapsed = time.perf_counter() - start
+
+        assert len(files) == args.n_records
+        print(
+            f"{dataset_class.__name__:>18} {elapsed:>8.2f} "
+            f"{args.n_records / elapsed:>10.0f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--n-records", type=int, default=100000)
+
+    run(parser.parse_args())
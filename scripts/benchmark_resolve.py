@@ -0,0 +1,99 @@
+"""Benchmark the offline resolution of URLs to services.
+
+Resolves URLs with the hostname and URL pattern lookups of the resolver,
+for registries with a growing number of (synthetic) hostnames. Compares
+the previous lookups (exact hostname and a loop over the URL patterns)
+with the precompiled matchers in datahugger.config.
+
+    python scripts/benchmark_resolve.py --n-urls 1000000
+"""
+
+import argparse
+import random
+import re
+import time
+from urllib.parse import urlparse
+
+from datahugger.config import SERVICES_NETLOC
+from datahugger.config import SERVICES_NETLOC_REGEXP
+from datahugger.matching import HostMatcher
+from datahugger.matching import PatternMatcher
+
+
+def create_registry(n_hosts):
+    registry = dict(SERVICES_NETLOC)
+    for i in range(n_hosts - len(registry)):
+        registry[f"data.repository{i}.example{i % 50}.org"] = object
+    return registry
+
+
+def create_urls(registry, n_urls, seed=0):
+    rng = random.Random(seed)
+    hosts = list(registry)
+    urls = []
+    for i in range(n_urls):
+        kind = i % 4
+        host = rng.choice(hosts)
+        if kind == 0:
+            urls.append(f"https://{host}/records/{i}")
+        elif kind == 1:
+            urls.append(f"https://www.{host}/records/{i}")
+        elif kind == 2:
+            urls.append(f"https://repo.example.com/articles/dataset/name/{i}")
+        else:
+            urls.append(f"https://unknown{i % 1000}.example.net/dataset/{i}")
+    return urls
+
+
+def resolve_loop(urls, registry, patterns):
+    for url in urls:
+        hostname = urlparse(url).hostname
+        if hostname in registry:
+            continue
+        for pattern in patterns:
+            if re.match(pattern, url):
+                break
+
+
+def resolve_matcher(urls, host_matcher, url_matcher):
+    for url in urls:
+        if host_matcher.match(urlparse(url).hostname) is None:
+            url_matcher.match(url)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n-urls", type=int, default=1_000_000)
+    parser.add_argument(
+        "--n-hosts", type=int, nargs="+", default=[len(SERVICES_NETLOC), 1000, 10000]
+    )
+    args = parser.parse_args()
+
+    print(f"{'hosts':>8} {'loop (us/url)':>14} {'matcher (us/url)':>17}")
+
+    for n_hosts in args.n_hosts:
+        registry = create_registry(n_hosts)
+        urls = create_urls(registry, args.n_urls)
+
+        t0 = time.perf_counter()
+        resolve_loop(urls, registry, SERVICES_NETLOC_REGEXP)
+        t_loop = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        host_matcher = HostMatcher(registry)
+        url_matcher = PatternMatcher(SERVICES_NETLOC_REGEXP)
+        t_build = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        resolve_matcher(urls, host_matcher, url_matcher)
+        t_matcher = time.perf_counter() - t0
+
+        print(
+            f"{len(registry):>8} {t_loop / len(urls) * 1e6:>14.2f} "
+            f"{t_matcher / len(urls) * 1e6:>17.2f}"
+            f"  (build {t_build * 1e3:.1f}ms)"
+        )
+
+
+if __name__ == "__main__":
+    main()
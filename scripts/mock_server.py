@@ -0,0 +1,122 @@
+"""Mock data repository for benchmarking the download engine.
+
+The server publishes a single record with synthetic files. Every request
+is delayed to simulate the round trip to a remote repository. With a
+capacity, the server throttles like a rate-limited repository: requests
+beyond the capacity (concurrent requests) get a 429 response.
+
+    /records/1            listing of the files in the record
+    /files/<i>            content of file i
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+
+
+class MockRepositoryHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    # avoid delayed ACKs between the headers and body on kept-alive connections
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, body, content_type="application/octet-stream"):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        server = self.server
+
+        with server.lock:
+            server.active += 1
+            server.peak = max(server.peak, server.active)
+            throttled = server.capacity is not None and server.active > server.capacity
+
+        try:
+            if throttled:
+                server.n_throttled += 1
+                self.send_response(429)
+                self.send_header("Retry-After", str(server.retry_after))
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+
+            time.sleep(server.latency)
+            self._respond()
+        finally:
+            with server.lock:
+                server.active -= 1
+
+    def _respond(self):
+        server = self.server
+
+        if self.path.startswith("/records/"):
+            files = [
+                {
+                    "name": f"file_{i}.bin",
+                    "link": f"{server.url}/files/{i}",
+                    "size": server.file_size,
+                }
+                for i in range(server.n_files)
+            ]
+            self._send(200, json.dumps({"files": files}).encode(), "application/json")
+        elif self.path.startswith("/files/"):
+            self._send(200, b"x" * server.file_size)
+        else:
+            self._send(404, b"")
+
+
+class MockRepository:
+    """Run the mock repository in a background thread.
+
+    Arguments
+    ---------
+    n_files: int
+        Number of files in the record.
+    file_size: int
+        Size of every file in bytes.
+    latency: float
+        Delay in seconds before every response.
+    capacity: int
+        Number of concurrent requests the server handles, the other
+        requests are throttled (429). Default: no limit.
+    retry_after: int
+        The Retry-After (seconds) of throttled requests.
+    """
+
+    def __init__(
+        self, n_files=100, file_size=1024, latency=0.05, capacity=None, retry_after=1
+    ):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), MockRepositoryHandler)
+        self.server.daemon_threads = True
+        self.server.n_files = n_files
+        self.server.file_size = file_size
+        self.server.latency = latency
+        self.server.capacity = capacity
+        self.server.retry_after = retry_after
+        self.server.lock = threading.Lock()
+        self.server.active = 0
+        self.server.peak = 0
+        self.server.n_throttled = 0
+        self.server.url = f"http://127.0.0.1:{self.server.server_port}"
+
+    @property
+    def url(self):
+        return self.server.url
+
+    def __enter__(self):
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def __exit__(self, *args):
+        self.server.shutdown()
+        self.server.server_close()
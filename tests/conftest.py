@@ -1,5 +1,10 @@
+import threading
+from http.server import SimpleHTTPRequestHandler
+from http.server import ThreadingHTTPServer
 from pathlib import Path
 
+import pytest
+
 try:
     import tomllib
 except ImportError:
@@ -40,3 +45,96 @@ def pytest_generate_tests(metafunc):
                     [v for _, service_v in test_repos.items() for v in service_v],
                 ),
             )
+
+
+class _RangeRequestHandler(SimpleHTTPRequestHandler):
+    """Static file handler with support for single byte ranges and ETags.
+
+    Requests to the paths in `server.faults` fail with the listed status
+    codes first.
+    """
+
+    def log_message(self, format, *args):
+        pass
+
+    def log_request(self, code="-", size="-"):
+        self.server.requests.append((self.command, self.path, int(code)))
+
+    def send_head(self):
+        # fail the first requests of a path with the given status codes
+        faults = self.server.faults.get(self.path)
+        if faults:
+            self.send_response(faults.pop(0))
+            self.send_header("Retry-After", "0")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return None
+
+        path = Path(self.translate_path(self.path))
+        if not path.is_file():
+            self.send_error(404, "File not found")
+            return None
+
+        size = path.stat().st_size
+        etag = f'"{size}-{path.stat().st_mtime_ns}"'
+        start, end = 0, size - 1
+
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return None
+
+        f = open(path, "rb")
+
+        range_header = self.headers.get("Range")
+        if range_header and range_header.startswith("bytes="):
+            first, last = range_header[6:].split("-")
+            start = int(first) if first else size - int(last)
+            end = min(int(last), size - 1) if first and last else size - 1
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{end}/{size}")
+        else:
+            self.send_response(200)
+
+        self.send_header("Content-Type", self.guess_type(str(path)))
+        self.send_header("Content-Length", str(end - start + 1))
+        self.send_header("Accept-Ranges", "bytes")
+        self.send_header("ETag", etag)
+        self.end_headers()
+
+        f.seek(start)
+        self._remaining = end - start + 1
+        return f
+
+    def copyfile(self, source, outputfile):
+        while self._remaining > 0:
+            chunk = source.read(min(65536, self._remaining))
+            if not chunk:
+                break
+            outputfile.write(chunk)
+            self._remaining -= len(chunk)
+
+
+@pytest.fixture
+def http_server(tmp_path):
+    """Serve a temporary folder over HTTP on localhost."""
+
+    root = tmp_path / "server"
+    root.mkdir()
+
+    def handler(*args, **kwargs):
+        return _RangeRequestHandler(*args, directory=str(root), **kwargs)
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    server.root = root
+    server.requests = []
+    server.faults = {}
+    server.url = f"http://127.0.0.1:{server.server_port}"
+    yield server
+
+    server.shutdown()
+    server.server_close()
@@ -0,0 +1,35 @@
+from datahugger.checkpoint import CrawlCheckpoint
+
+
+def test_checkpoint_incomplete_line(tmp_path):
+    path = tmp_path / "crawl.jsonl"
+
+    checkpoint = CrawlCheckpoint(path, "https://example.org/1")
+    checkpoint.add("u1", ([("folder", "x")], None))
+    checkpoint.close()
+
+    # a crawl killed in the middle of a write
+    with open(path, "a") as f:
+        f.write('{"url": "u2", "ite')
+
+    checkpoint = CrawlCheckpoint(path, "https://example.org/1")
+    assert list(checkpoint.pages) == ["u1"]
+    checkpoint.add("u2", ([("folder", "y")], None))
+    checkpoint.add("u3", ([], None))
+    checkpoint.close()
+
+    checkpoint = CrawlCheckpoint(path, "https://example.org/1")
+    assert list(checkpoint.pages) == ["u1", "u2", "u3"]
+    checkpoint.close(completed=True)
+
+
+def test_checkpoint_other_resource(tmp_path):
+    path = tmp_path / "crawl.jsonl"
+
+    checkpoint = CrawlCheckpoint(path, "https://example.org/1")
+    checkpoint.add("u1", ([("folder", "x")], None))
+    checkpoint.close()
+
+    checkpoint = CrawlCheckpoint(path, "https://example.org/2")
+    assert checkpoint.pages == {}
+    checkpoint.close()
@@ -0,0 +1,741 @@
+import hashlib
+import io
+import json
+import os
+import threading
+import time
+import zipfile
+
+import pytest
+import requests
+
+import datahugger
+import datahugger.base
+import datahugger.batch
+import datahugger.session
+from datahugger.base import DatasetDownloader
+from datahugger.manifest import write_manifest
+from datahugger.policy import AIMDController
+from datahugger.policy import TokenBucket
+from datahugger.policy import TransferPolicy
+from datahugger.policy import get_host_limiter
+from datahugger.scheduler import FairExecutor
+from datahugger.session import PooledSession
+from datahugger.session import create_session
+from datahugger.session import evict_cache
+
+
+class LocalDataset(DatasetDownloader):
+    """Downloader for a dataset served by the local test server."""
+
+    REGEXP_ID = r"records/(?P<record_id>\d+)"
+
+    API_URL_META = "{base_url}/records/{record_id}.json"
+    META_FILES_JSONPATH = "files[*]"
+
+    ATTR_NAME_JSONPATH = "name"
+    ATTR_FILE_LINK_JSONPATH = "link"
+    ATTR_SIZE_JSONPATH = "size"
+    ATTR_HASH_JSONPATH = "md5"
+    ATTR_HASH_TYPE_VALUE = "md5"
+
+
+class CountingSession(PooledSession):
+    """Session that counts the number of requests."""
+
+    n_requests = 0
+
+    def request(self, method, url, **kwargs):
+        self.n_requests += 1
+        return super().request(method, url, **kwargs)
+
+
+def _publish(server, files, record_id=1):
+    """Write files to the server and publish a listing for them."""
+
+    (server.root / "records").mkdir(exist_ok=True)
+    (server.root / "files").mkdir(exist_ok=True)
+
+    listing = []
+    for name, content in files.items():
+        (server.root / "files" / name).write_bytes(content)
+        listing.append(
+            {
+                "name": name,
+                "link": f"{server.url}/files/{name}",
+                "size": len(content),
+                "md5": hashlib.md5(content).hexdigest(),
+            }
+        )
+
+    with open(server.root / "records" / f"{record_id}.json", "w") as f:
+        json.dump({"files": listing}, f)
+
+    return f"{server.url}/records/{record_id}"
+
+
+@pytest.mark.parametrize("max_workers", [1, 4])
+def test_download_concurrent(http_server, tmp_path, max_workers):
+    files = {f"file_{i}.txt": f"content {i}".encode() for i in range(20)}
+    url = _publish(http_server, files)
+
+    LocalDataset(url, progress=False, max_workers=max_workers).download(
+        tmp_path / "out"
+    )
+
+    for name, content in files.items():
+        assert (tmp_path / "out" / name).read_bytes() == content
+
+
+def test_download_concurrent_max_file_size(http_server, tmp_path):
+    url = _publish(http_server, {"small.txt": b"a", "large.txt": b"a" * 100})
+
+    LocalDataset(url, progress=False, max_file_size=50, max_workers=2).download(
+        tmp_path / "out"
+    )
+
+    assert (tmp_path / "out" / "small.txt").exists()
+    assert not (tmp_path / "out" / "large.txt").exists()
+
+
+def test_download_concurrent_error(http_server, tmp_path):
+    url = _publish(http_server, {f"file_{i}.txt": b"data" for i in range(5)})
+    (http_server.root / "files" / "file_0.txt").unlink()
+
+    with pytest.raises(requests.HTTPError):
+        LocalDataset(url, progress=False, max_workers=2).download(tmp_path / "out")
+
+    # the other files are downloaded regardless of the failed file
+    for i in range(1, 5):
+        assert (tmp_path / "out" / f"file_{i}.txt").exists()
+
+
+def test_download_shared_session(http_server, tmp_path):
+    url = _publish(http_server, {f"file_{i}.txt": b"data" for i in range(5)})
+
+    session = CountingSession()
+    LocalDataset(url, progress=False, session=session).download(tmp_path / "out")
+
+    # one listing request and one request per file
+    assert session.n_requests == 6
+
+
+@pytest.mark.parametrize("size", [100, 10000])
+def test_download_segmented(http_server, tmp_path, monkeypatch, size):
+    monkeypatch.setattr(datahugger.base, "SEGMENT_MIN_SIZE", 1024)
+
+    content = os.urandom(size)
+    url = _publish(http_server, {"large.bin": content})
+
+    LocalDataset(url, progress=False, segments=4).download(tmp_path / "out")
+
+    assert (tmp_path / "out" / "large.bin").read_bytes() == content
+
+
+def test_download_segmented_retry(http_server, tmp_path, monkeypatch):
+    monkeypatch.setattr(datahugger.base, "SEGMENT_MIN_SIZE", 1024)
+
+    content = os.urandom(10000)
+    url = _publish(http_server, {"large.bin": content})
+
+    session = create_session()
+    request = session.request
+    interrupted = []
+
+    def faulty_request(method, url, **kwargs):
+        res = request(method, url, **kwargs)
+
+        if method == "HEAD":
+            # fail the first range request
+            http_server.faults["/files/large.bin"] = [503]
+        elif "Range" in kwargs.get("headers", {}) and res.ok and not interrupted:
+            # interrupt the transfer of a range after the first chunk
+            interrupted.append(kwargs["headers"]["Range"])
+            iter_content = res.iter_content
+
+            def interrupted_content(*args, **kwargs):
+                chunks = iter_content(*args, **kwargs)
+                yield next(chunks)
+                raise requests.exceptions.ChunkedEncodingError("connection reset")
+
+            res.iter_content = interrupted_content
+
+        return res
+
+    session.request = faulty_request
+
+    result = LocalDataset(
+        url,
+        progress=False,
+        segments=4,
+        session=session,
+        params={"chunk_size": 100},
+    ).download(tmp_path / "out")
+
+    assert (result.n_retries, result.n_failed) == (2, 0)
+    assert (tmp_path / "out" / "large.bin").read_bytes() == content
+
+
+@pytest.mark.parametrize("size", [10000, 5000])
+def test_download_resume(http_server, tmp_path, size):
+    content = os.urandom(10000)
+    url = _publish(http_server, {"large.bin": content})
+    link = f"{http_server.url}/files/large.bin"
+
+    # simulate an interrupted download, outdated if the size doesn't match
+    (tmp_path / "out").mkdir()
+    (tmp_path / "out" / "large.bin.part").write_bytes(content[:4000])
+    with open(tmp_path / "out" / "large.bin.part.json", "w") as f:
+        etag = requests.head(link).headers["etag"]
+        json.dump({"link": link, "etag": etag, "last_modified": None, "size": size}, f)
+
+    LocalDataset(url, progress=False).download(tmp_path / "out")
+
+    assert (tmp_path / "out" / "large.bin").read_bytes() == content
+    assert not (tmp_path / "out" / "large.bin.part").exists()
+    assert not (tmp_path / "out" / "large.bin.part.json").exists()
+
+
+@pytest.mark.parametrize("part_info", ["", '{"link": "', "[]", '{"etag": null}'])
+def test_download_resume_invalid_part_info(http_server, tmp_path, part_info):
+    content = os.urandom(10000)
+    url = _publish(http_server, {"large.bin": content})
+
+    # the validators of an interrupted download are incomplete
+    (tmp_path / "out").mkdir()
+    (tmp_path / "out" / "large.bin.part").write_bytes(content[:4000])
+    (tmp_path / "out" / "large.bin.part.json").write_text(part_info)
+
+    LocalDataset(url, progress=False).download(tmp_path / "out")
+
+    assert (tmp_path / "out" / "large.bin").read_bytes() == content
+    assert not (tmp_path / "out" / "large.bin.part.json").exists()
+
+
+def test_download_sync(http_server, tmp_path):
+    files = {f"file_{i}.txt": f"content {i}".encode() for i in range(5)}
+    url = _publish(http_server, files)
+
+    LocalDataset(url, progress=False).download(tmp_path / "out")
+
+    # change a file (same size) and remove another one
+    (tmp_path / "out" / "file_0.txt").write_bytes(b"changed 0")
+    (tmp_path / "out" / "file_1.txt").unlink()
+
+    session = CountingSession()
+    LocalDataset(url, progress=False, sync=True, session=session).download(
+        tmp_path / "out"
+    )
+
+    # one listing request and the two outdated files
+    assert session.n_requests == 3
+    for name, content in files.items():
+        assert (tmp_path / "out" / name).read_bytes() == content
+
+    session = CountingSession()
+    LocalDataset(url, progress=False, sync=True, session=session).download(
+        tmp_path / "out"
+    )
+    assert session.n_requests == 1
+
+
+def test_download_sync_unknown_hash_type(http_server, tmp_path):
+    class UnknownHashDataset(LocalDataset):
+        ATTR_HASH_TYPE_VALUE = "checkSum.value"
+
+    files = {"a.txt": b"a", "b.txt": b"b"}
+    url = _publish(http_server, files)
+
+    UnknownHashDataset(url, progress=False).download(tmp_path / "out")
+    (tmp_path / "out" / "b.txt").write_bytes(b"bb")
+
+    # files with the listed size are current, the others are downloaded
+    session = CountingSession()
+    UnknownHashDataset(url, progress=False, sync=True, session=session).download(
+        tmp_path / "out"
+    )
+
+    assert session.n_requests == 2
+    for name, content in files.items():
+        assert (tmp_path / "out" / name).read_bytes() == content
+
+
+def test_download_checksum(http_server, tmp_path):
+    url = _publish(http_server, {"a.txt": b"a", "b.txt": b"b"})
+
+    # corrupt the hash of one of the files in the listing
+    listing_fp = http_server.root / "records" / "1.json"
+    listing = json.loads(listing_fp.read_text())
+    listing["files"][1]["md5"] = hashlib.md5(b"c").hexdigest()
+    listing_fp.write_text(json.dumps(listing))
+
+    LocalDataset(url, progress=False, checksum=True).download(tmp_path / "out")
+
+    (checksums_fp,) = (tmp_path / "out" / "generated").glob("checksums*.json")
+    assert json.loads(checksums_fp.read_text()) == {"a.txt": True, "b.txt": False}
+
+
+def test_download_unzip(http_server, tmp_path):
+    members = {f"folder/file_{i}.txt": os.urandom(1000) for i in range(10)}
+
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, "w") as z:
+        for name, content in members.items():
+            z.writestr(name, content)
+
+    url = _publish(http_server, {"archive.zip": archive.getvalue()})
+
+    LocalDataset(url, progress=False, checksum=True, max_workers=3).download(
+        tmp_path / "out"
+    )
+
+    for name, content in members.items():
+        assert (tmp_path / "out" / name.split("/")[-1]).read_bytes() == content
+
+
+def test_download_remote_unzip(http_server, tmp_path):
+    members = {f"folder/file_{i}.bin": os.urandom(100000) for i in range(20)}
+    members["folder/README.md"] = b"readme"
+
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, "w") as z:
+        for name, content in members.items():
+            z.writestr(name, content)
+
+    url = _publish(http_server, {"archive.zip": archive.getvalue()})
+
+    session = CountingSession()
+    dataset = LocalDataset(
+        url,
+        progress=False,
+        remote_unzip=True,
+        include=["*README*", "*file_3.bin"],
+        session=session,
+    )
+
+    assert sorted(f["name"] for f in dataset.files) == sorted(members)
+
+    dataset.download(tmp_path / "out")
+
+    for name in ["folder/README.md", "folder/file_3.bin"]:
+        assert (tmp_path / "out" / name).read_bytes() == members[name]
+    assert len(list((tmp_path / "out").rglob("*.*"))) == 2
+
+    # listing, probe and central directory plus a few ranges per member
+    assert session.n_requests < 10
+
+
+def test_iter_files(http_server):
+    files = {f"file_{i}.txt": b"data" for i in range(5)}
+    url = _publish(http_server, files)
+
+    session = CountingSession()
+    dataset = LocalDataset(url, progress=False, session=session)
+
+    assert [f["name"] for f in dataset.iter_files()] == list(files)
+
+    # the completed listing is cached
+    assert [f["name"] for f in dataset.files] == list(files)
+    assert session.n_requests == 1
+
+
+class LocalTreeDataset(LocalDataset):
+    """Downloader for a paginated tree of folders on the local test server."""
+
+    PAGINATION_JSONPATH = "next"
+
+    ATTR_KIND_JSONPATH = "kind"
+    ATTR_FOLDER_LINK_JSONPATH = "link"
+
+
+def _publish_tree(server, pages):
+    """Publish pages of a listing with files and folders."""
+
+    (server.root / "records").mkdir(exist_ok=True)
+
+    for page_id, (items, next_page) in pages.items():
+        listing = {
+            "files": [
+                {
+                    "kind": kind,
+                    "name": name,
+                    "link": f"{server.url}/records/{name}.json"
+                    if kind == "folder"
+                    else f"{server.url}/files/{name}",
+                }
+                for kind, name in items
+            ],
+            "next": next_page and f"{server.url}/records/{next_page}.json",
+        }
+        with open(server.root / "records" / f"{page_id}.json", "w") as f:
+            json.dump(listing, f)
+
+    return f"{server.url}/records/1"
+
+
+@pytest.mark.parametrize("max_workers", [1, 4])
+def test_iter_files_tree(http_server, max_workers):
+    url = _publish_tree(
+        http_server,
+        {
+            "1": ([("file", "a.txt"), ("folder", "x"), ("file", "b.txt")], "2"),
+            "2": ([("file", "c.txt"), ("folder", "y")], None),
+            "x": ([("file", "x1.txt"), ("folder", "z")], "x-2"),
+            "x-2": ([("file", "x2.txt")], None),
+            "y": ([("file", "y1.txt")], None),
+            "z": ([("file", "z1.txt")], None),
+        },
+    )
+
+    dataset = LocalTreeDataset(url, progress=False, max_workers=max_workers)
+
+    assert [f["name"] for f in dataset.iter_files()] == [
+        "a.txt",
+        "x/x1.txt",
+        "x/z/z1.txt",
+        "x/x2.txt",
+        "b.txt",
+        "c.txt",
+        "y/y1.txt",
+    ]
+
+
+def test_iter_files_deep_tree(http_server):
+    depth = 1200
+    url = _publish_tree(
+        http_server,
+        {
+            "1": ([("folder", "d0")], None),
+            **{f"d{i}": ([("folder", f"d{i + 1}")], None) for i in range(depth)},
+            f"d{depth}": ([("file", "deep.txt")], None),
+        },
+    )
+
+    (record,) = LocalTreeDataset(url, progress=False).iter_files()
+
+    assert record["name"].count("/") == depth + 1
+
+
+def test_iter_files_checkpoint(http_server, tmp_path):
+    url = _publish_tree(
+        http_server,
+        {
+            "1": ([("file", "a.txt"), ("folder", "x")], "2"),
+            "2": ([("folder", "y")], None),
+            "x": ([("file", "x1.txt")], None),
+            "y": ([("file", "y1.txt")], None),
+        },
+    )
+    checkpoint = tmp_path / "crawl.jsonl"
+
+    # interrupt the crawl at the last folder
+    (http_server.root / "records" / "y.json").rename(tmp_path / "y.json")
+    with pytest.raises(requests.HTTPError):
+        list(LocalTreeDataset(url, checkpoint=checkpoint).iter_files())
+    assert checkpoint.exists()
+
+    (tmp_path / "y.json").rename(http_server.root / "records" / "y.json")
+    session = CountingSession()
+    dataset = LocalTreeDataset(url, checkpoint=checkpoint, session=session)
+
+    assert [f["name"] for f in dataset.files] == ["a.txt", "x/x1.txt", "y/y1.txt"]
+    assert session.n_requests == 1
+    assert not checkpoint.exists()
+
+
+def test_download_custom_files_property(http_server, tmp_path):
+    url = _publish(http_server, {"a.txt": b"a", "b.csv": b"b"})
+
+    class CustomDataset(LocalDataset):
+        @property
+        def files(self):
+            return [
+                {"link": f"{http_server.url}/files/a.txt", "name": "c.txt"},
+            ]
+
+    class FilteredDataset(LocalDataset):
+        @property
+        def files(self):
+            return [f for f in super().files if f["name"].endswith(".csv")]
+
+    # the previous extension point (overriding files) is still used
+    CustomDataset(url, progress=False).download(tmp_path / "custom")
+    assert os.listdir(tmp_path / "custom") == ["c.txt"]
+
+    FilteredDataset(url, progress=False).download(tmp_path / "filtered")
+    assert os.listdir(tmp_path / "filtered") == ["b.csv"]
+
+
+def test_download_manifest(http_server, tmp_path):
+    files = {f"file_{i}.txt": f"content {i}".encode() for i in range(5)}
+    url = _publish(http_server, files)
+
+    dataset = LocalDataset(url, progress=False)
+    write_manifest(dataset, tmp_path / "manifest.json")
+
+    # the listing isn't available anymore, the files are
+    (http_server.root / "records" / "1.json").unlink()
+
+    session = CountingSession()
+    datahugger.get(
+        tmp_path / "manifest.json", tmp_path / "out", progress=False, session=session
+    )
+
+    assert session.n_requests == len(files)
+    for name, content in files.items():
+        assert (tmp_path / "out" / name).read_bytes() == content
+
+
+def test_download_cache(http_server, tmp_path):
+    url = _publish(http_server, {"a.txt": b"a"})
+    cache = tmp_path / "cache"
+
+    def download():
+        http_server.requests.clear()
+        LocalDataset(
+            url,
+            progress=False,
+            force_download=True,
+            session=create_session(cache=cache),
+        ).download(tmp_path / "out")
+        return sorted(http_server.requests)
+
+    assert download() == [("GET", "/files/a.txt", 200), ("GET", "/records/1.json", 200)]
+
+    # the listing is served from the cache, the file isn't
+    assert download() == [("GET", "/files/a.txt", 200)]
+
+    # expired responses are revalidated
+    create_session(cache=cache).cache.reset_expiration(0)
+    assert download() == [("GET", "/files/a.txt", 200), ("GET", "/records/1.json", 304)]
+
+    # evict all responses beyond the maximum size
+    session = create_session(cache=cache)
+    evict_cache(session, max_size=0)
+    assert len(session.cache.responses) == 0
+
+
+def test_evict_cache_interval(tmp_path, monkeypatch):
+    evicted = []
+    monkeypatch.setattr(
+        datahugger.session, "evict_cache", lambda session: evicted.append(session)
+    )
+
+    # the cache is evicted by the first session of the interval only
+    create_session(cache=tmp_path)
+    create_session(cache=tmp_path)
+    assert len(evicted) == 1
+
+    marker = tmp_path / datahugger.session.CACHE_EVICT_MARKER
+    os.utime(marker, (0, 0))
+    create_session(cache=tmp_path)
+    assert len(evicted) == 2
+
+
+def test_fair_executor():
+    gate = threading.Event()
+    order = []
+
+    with FairExecutor(1) as executor:
+        # keep the worker busy until all tasks are queued
+        executor.submit("gate", gate.wait)
+        for key in ["a", "b"]:
+            for i in range(3):
+                executor.submit(key, order.append, f"{key}{i}")
+        gate.set()
+
+    assert order == ["a0", "b0", "a1", "b1", "a2", "b2"]
+
+
+def test_get_many(http_server, tmp_path):
+    manifests = []
+    for record_id in [1, 2]:
+        files = {f"file_{record_id}_{i}.txt": b"content" for i in range(10)}
+        url = _publish(http_server, files, record_id=record_id)
+        manifests.append(tmp_path / f"dataset_{record_id}.json")
+        write_manifest(LocalDataset(url, progress=False), manifests[-1])
+
+    results = datahugger.get_many(
+        [*manifests, "not-a-dataset"], tmp_path / "out", max_workers=4
+    )
+
+    assert [r.ok for r in results] == [True, True, False]
+    assert results[2].to_dict()["error"]["type"] == "ValueError"
+    assert results[0].to_dict()["n_files"] == 10
+    for record_id in [1, 2]:
+        folder = tmp_path / "out" / f"dataset_{record_id}"
+        assert len(list(folder.iterdir())) == 10
+
+
+def test_info_many_tree(http_server, monkeypatch):
+    url = _publish_tree(
+        http_server,
+        {
+            "1": ([("file", "a.txt"), ("folder", "x")], "2"),
+            "2": ([("file", "b.txt")], None),
+            "x": ([("file", "x1.txt")], None),
+        },
+    )
+
+    # resolve the local URLs to the tree dataset
+    monkeypatch.setattr(
+        datahugger.batch,
+        "info",
+        lambda resource, cache, **kwargs: LocalTreeDataset(resource, **kwargs),
+    )
+
+    results = datahugger.info_many([url, url, f"{http_server.url}/records/404"])
+
+    assert [r.ok for r in results] == [True, True, False]
+    for r in results[:2]:
+        assert [f["name"] for f in r.dataset.files] == ["a.txt", "x/x1.txt", "b.txt"]
+
+
+def test_transfer_policy(http_server):
+    url = _publish(http_server, {"a.txt": b"a"})
+
+    class LimitedDataset(LocalDataset):
+        TRANSFER_POLICY = TransferPolicy(max_connections=2, segments=4)
+
+    policy = LimitedDataset(url, progress=False).policy
+    assert (policy.max_connections, policy.segments) == (2, 4)
+
+    # segments and params take precedence over the policy of the service
+    policy = LimitedDataset(
+        url, segments=8, params={"max_connections": "1", "chunk_size": "1024"}
+    ).policy
+    assert (policy.max_connections, policy.chunk_size, policy.segments) == (
+        1,
+        1024,
+        8,
+    )
+
+
+@pytest.mark.parametrize(
+    "value,adaptive", [("true", True), ("1", True), ("off", False), (1, True)]
+)
+def test_transfer_policy_boolean(value, adaptive):
+    policy = TransferPolicy().override({"adaptive": value})
+    assert policy.adaptive is adaptive
+
+
+@pytest.mark.parametrize("params", [{"adaptive": "maybe"}, {"segments": "four"}])
+def test_transfer_policy_invalid(params):
+    with pytest.raises(ValueError, match="Invalid value"):
+        TransferPolicy().override(params)
+
+
+def test_token_bucket():
+    bucket = TokenBucket(rate=1200)
+
+    start = time.monotonic()
+    for _ in range(30):
+        bucket.acquire()
+
+    # a burst of a second (20 requests), the other 10 at 20 per second
+    assert 0.4 < time.monotonic() - start < 1.5
+
+
+def test_aimd_controller():
+    controller = AIMDController(max_limit=8, initial=2)
+
+    # one more request per round of successful requests, up to the maximum
+    for _ in range(100):
+        controller.record_success(0.01)
+    assert controller.limit == 8
+
+    controller.record_failure()
+    assert controller.limit == 4
+
+    # the other failures of the same round trip don't cut the limit again
+    controller.record_failure()
+    assert controller.limit == 4
+
+    # rising latency cuts the limit as well
+    controller = AIMDController(max_limit=8, initial=4)
+    controller.record_success(0.01)
+    for _ in range(10):
+        controller.record_success(1.0)
+    assert controller.limit < 4
+
+
+def test_download_max_connections(http_server, tmp_path, monkeypatch):
+    files = {f"file_{i}.txt": f"content {i}".encode() * 1000 for i in range(10)}
+    url = _publish(http_server, files)
+
+    active = []
+    peak = []
+    lock = threading.Lock()
+    download_file_stream = LocalDataset._download_file_stream
+
+    def counting_download(self, *args, **kwargs):
+        with lock:
+            active.append(1)
+            peak.append(len(active))
+        try:
+            time.sleep(0.01)
+            return download_file_stream(self, *args, **kwargs)
+        finally:
+            with lock:
+                active.pop()
+
+    monkeypatch.setattr(LocalDataset, "_download_file_stream", counting_download)
+
+    dataset = LocalDataset(
+        url,
+        progress=False,
+        max_workers=8,
+        params={"max_connections": 2, "chunk_size": 100},
+    )
+    dataset.download(tmp_path)
+
+    assert max(peak) <= 2
+    for name, content in files.items():
+        assert (tmp_path / name).read_bytes() == content
+
+
+def test_download_retry(http_server, tmp_path):
+    files = {f"file_{i}.txt": f"content {i}".encode() for i in range(5)}
+    url = _publish(http_server, files)
+
+    http_server.faults["/records/1.json"] = [503]
+    http_server.faults["/files/file_0.txt"] = [429, 502]
+
+    result = LocalDataset(url, progress=False, max_workers=2).download(tmp_path)
+
+    assert (result.n_retries, result.n_failed) == (3, 0)
+    for name, content in files.items():
+        assert (tmp_path / name).read_bytes() == content
+
+
+def test_download_adaptive(http_server, tmp_path):
+    files = {f"file_{i}.txt": f"content {i}".encode() for i in range(20)}
+    url = _publish(http_server, files)
+
+    http_server.faults["/files/file_0.txt"] = [429]
+
+    dataset = LocalDataset(url, progress=False, max_workers=8, params={"adaptive": "1"})
+    result = dataset.download(tmp_path)
+
+    assert dataset.policy.adaptive == 1
+    controller = get_host_limiter(url.split("/")[2], dataset.policy).controller
+    assert 1 <= controller.limit <= 8
+
+    assert (result.n_retries, result.n_failed) == (1, 0)
+    for name, content in files.items():
+        assert (tmp_path / name).read_bytes() == content
+
+
+def test_download_retry_once(http_server, tmp_path):
+    url = _publish(http_server, {"a.txt": b"a"})
+
+    http_server.faults["/files/a.txt"] = [503] * 20
+
+    dataset = LocalDataset(url, progress=False)
+    with pytest.raises(requests.HTTPError):
+        dataset.download(tmp_path)
+
+    # a single retry layer, the request and 5 retries
+    attempts = [r for r in http_server.requests if r[1] == "/files/a.txt"]
+    assert len(attempts) == 6
+    assert (dataset.retry_stats.retries, dataset.retry_stats.failures) == (5, 1)
@@ -0,0 +1,77 @@
+import json
+
+from datahugger.files import FileList
+from datahugger.files import FileRecord
+
+FILES = [
+    {"link": "l/a", "name": "a.csv", "size": 10, "hash": "x", "hash_type": "md5"},
+    {"link": "l/b", "name": "b.txt", "size": None, "hash": None, "hash_type": None},
+    {"link": "l/c", "name": "sub/c.csv", "size": 300, "hash": None, "hash_type": None},
+]
+
+
+def test_file_record_dict_compatible():
+    record = FileRecord(**FILES[0])
+
+    assert record == FILES[0]
+    assert record["name"] == record.name == "a.csv"
+    assert record.get("missing") is None
+    assert json.loads(json.dumps(record)) == FILES[0]
+    assert not hasattr(record, "__dict__")
+
+    record.name = "b.csv"
+    assert record["name"] == "b.csv"
+
+
+def test_file_list():
+    files = FileList(FILES)
+
+    assert len(files) == 3
+    assert files == FILES
+    assert files[-1] == FILES[-1]
+    assert files[1:] == FILES[1:]
+    assert files.total_size == 310
+    assert files.column("name") == ["a.csv", "b.txt", "sub/c.csv"]
+    assert files.to_list() == FILES
+
+
+def test_file_list_mutable():
+    files = FileList(FILES[:2])
+
+    # the records are changed in place
+    files[0]["name"] = "renamed.csv"
+    assert files.column("name") == ["renamed.csv", "b.txt"]
+
+    # filters select the same records
+    files.filter(pattern="*.txt")[0]["size"] = 5
+    assert files[1]["size"] == 5
+
+    assert (files + [FILES[2]]).column("link") == ["l/a", "l/b", "l/c"]
+    assert ([FILES[2]] + files)[0]["link"] == "l/c"
+    assert len(files) == 2
+
+    files += FILES[2:]
+    assert len(files) == 3
+
+    assert json.loads(json.dumps(files))[0]["name"] == "renamed.csv"
+    assert json.loads(json.dumps(files[0]))["name"] == "renamed.csv"
+
+
+def test_file_list_filter():
+    files = FileList(FILES)
+
+    assert files.filter(min_size=100).column("name") == ["b.txt", "sub/c.csv"]
+    assert files.filter(max_size=100).column("name") == ["a.csv", "b.txt"]
+    assert files.filter(pattern="*.csv").column("name") == ["a.csv", "sub/c.csv"]
+    assert files.filter(pattern=["a*", "b*"]).column("name") == ["a.csv", "b.txt"]
+    assert files.filter(name="^sub/").column("name") == ["sub/c.csv"]
+
+
+def test_file_list_sort():
+    files = FileList(FILES)
+
+    files.sort("link", reverse=True)
+    assert files.column("link") == ["l/c", "l/b", "l/a"]
+
+    files.sort(lambda f: f["size"] or 0)
+    assert files.column("link") == ["l/b", "l/a", "l/c"]
@@ -0,0 +1,38 @@
+import pytest
+from jsonpath_ng.ext import parse
+
+from datahugger.base import _compile_jsonpath
+from datahugger.base import _DottedPath
+
+RECORD = {
+    "key": "file.csv",
+    "attributes": {"size": 10, "extra": {"hashes": {"sha256": None}}},
+    "content_details": {"sha256_hash": "abc"},
+    "files": [{"name": "a"}, {"name": "b"}],
+}
+
+
+@pytest.mark.parametrize(
+    "jsonp",
+    [
+        "key",
+        "attributes.size",
+        "attributes.extra.hashes.sha256",
+        "content_details.sha256_hash",
+        "missing",
+        "key.missing",
+        "files",
+    ],
+)
+def test_dotted_path(jsonp):
+    expression = _compile_jsonpath(jsonp)
+
+    assert isinstance(expression, _DottedPath)
+    assert expression.all(RECORD) == [x.value for x in parse(jsonp).find(RECORD)]
+
+
+def test_jsonpath_compiled_once():
+    expression = _compile_jsonpath("files[*].name")
+
+    assert expression is _compile_jsonpath("files[*].name")
+    assert expression.all(RECORD) == ["a", "b"]
@@ -0,0 +1,75 @@
+import shutil
+
+import pytest
+
+import datahugger.re3data
+import datahugger.resolvers
+from datahugger.handles import DOI
+from datahugger.re3data import RE3DATA_INDEX_NAME
+from datahugger.re3data import build_re3data_index
+from datahugger.re3data import get_publisher_software
+from datahugger.resolvers import _resolve_service_with_re3data
+from datahugger.services import DataverseDataset
+
+REPOSITORIES = {
+    "r3d1": ("DataverseNL", "Dataverse"),
+    "r3d2": ("Some DSpace", "DSpace"),
+    "r3d3": ("Unknown software", None),
+}
+
+
+@pytest.fixture
+def re3data_index(tmp_path, monkeypatch):
+    """Build the publisher index from a fixed set of repositories."""
+
+    def get_repository(re3data_id, session=None):
+        software = REPOSITORIES[re3data_id][1]
+        if software is None:
+            raise AttributeError("No software")
+        return software
+
+    monkeypatch.setattr(
+        datahugger.re3data,
+        "get_re3data_repositories",
+        lambda: [{"id": k, "name": v[0]} for k, v in REPOSITORIES.items()],
+    )
+    monkeypatch.setattr(datahugger.re3data, "get_re3data_repository", get_repository)
+
+    build_re3data_index(cache=tmp_path, max_workers=2)
+
+    return tmp_path
+
+
+def test_publisher_software(re3data_index):
+    assert get_publisher_software("dataversenl", cache=re3data_index) == "dataverse"
+    assert get_publisher_software("Some DSpace", cache=re3data_index) == "dspace"
+    assert get_publisher_software("Unknown software", cache=re3data_index) is None
+    assert get_publisher_software("Missing", cache=re3data_index) is None
+
+
+def test_publisher_software_no_index(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        get_publisher_software("DataverseNL", cache=tmp_path)
+
+
+def test_publisher_software_index_built_later(re3data_index):
+    other = re3data_index / "other"
+    with pytest.raises(FileNotFoundError):
+        get_publisher_software("DataverseNL", cache=other)
+
+    # the missing index isn't remembered
+    other.mkdir()
+    shutil.copy(re3data_index / RE3DATA_INDEX_NAME, other)
+    assert get_publisher_software("DataverseNL", cache=other) == "dataverse"
+
+
+def test_resolve_service_with_index(re3data_index, monkeypatch):
+    monkeypatch.setattr(
+        datahugger.resolvers,
+        "get_datapublisher_from_doi",
+        lambda doi, session=None: "DataverseNL",
+    )
+    monkeypatch.setattr(datahugger.resolvers, "get_re3data_repositories", pytest.fail)
+
+    doi = DOI.parse("10.1234/example")
+    assert _resolve_service_with_re3data(doi, cache=re3data_index) is DataverseDataset
@@ -0,0 +1,82 @@
+import pytest
+import requests
+
+import datahugger
+import datahugger.resolvers
+from datahugger.exceptions import RepositoryNotSupportedError
+from datahugger.handles import DOI
+from datahugger.resolve_cache import ResolveCache
+from datahugger.services import ZenodoDataset
+
+
+@pytest.fixture
+def resolved_dois(monkeypatch):
+    """Resolve DOIs offline and record the resolved DOIs."""
+
+    resolved = []
+
+    def resolve(self, session=None):
+        resolved.append(self.doi)
+        self._resolved_url = f"https://zenodo.org/records/{self.doi.split('.')[-1]}"
+        return self._resolved_url
+
+    monkeypatch.setattr(DOI, "resolve", resolve)
+    return resolved
+
+
+def test_resolve_cache(tmp_path, resolved_dois):
+    for _ in range(3):
+        dataset = datahugger.info("10.1234/example.6625880", cache=tmp_path)
+
+        assert isinstance(dataset, ZenodoDataset)
+        assert dataset.resource.url == "https://zenodo.org/records/6625880"
+
+    assert resolved_dois == ["10.1234/example.6625880"]
+
+
+def test_resolve_cache_negative(tmp_path, resolved_dois, monkeypatch):
+    monkeypatch.setattr(
+        datahugger.resolvers, "_resolve_service_from_netloc", lambda resource: None
+    )
+    monkeypatch.setattr(
+        datahugger.resolvers,
+        "_resolve_service_with_re3data",
+        lambda resource, session=None, cache=True: None,
+    )
+
+    for _ in range(3):
+        with pytest.raises(RepositoryNotSupportedError):
+            datahugger.info("10.1234/example.1", cache=tmp_path)
+
+    assert resolved_dois == ["10.1234/example.1"]
+
+
+def test_resolve_cache_ttl(tmp_path):
+    cache = ResolveCache(tmp_path, ttl=60, negative_ttl=0)
+
+    cache.set("a", url="https://zenodo.org/records/1", service="ZenodoDataset")
+    cache.set("b", error=RepositoryNotSupportedError("b"))
+
+    assert cache.get("a") == ("https://zenodo.org/records/1", "ZenodoDataset")
+    assert cache.get("b") is None
+
+
+def test_resolve_cache_transient_error(tmp_path, resolved_dois, monkeypatch):
+    def get_publisher(doi, session=None):
+        response = requests.Response()
+        response.status_code = 503
+        raise requests.HTTPError("Service Unavailable", response=response)
+
+    monkeypatch.setattr(
+        datahugger.resolvers, "_resolve_service_from_netloc", lambda resource: None
+    )
+    monkeypatch.setattr(
+        datahugger.resolvers, "get_datapublisher_from_doi", get_publisher
+    )
+
+    # a transient error isn't cached as an unsupported repository
+    for _ in range(2):
+        with pytest.raises(requests.HTTPError):
+            datahugger.info("10.1234/example.1", cache=tmp_path)
+
+    assert resolved_dois == ["10.1234/example.1"] * 2
@@ -2,9 +2,20 @@ import pytest
 
 import datahugger
 from datahugger.api import _resolve_service
+from datahugger.api import parse_resource_identifier
+from datahugger.exceptions import RepositoryNotSupportedError
 from datahugger.handles import DOI
 from datahugger.handles import ArXiv
+from datahugger.handles import Handle
+from datahugger.handles import parse_identifier
+from datahugger.matching import HostMatcher
+from datahugger.matching import PatternMatcher
+from datahugger.services import ArXivDataset
+from datahugger.services import DataDryadDataset
 from datahugger.services import DataverseDataset
+from datahugger.services import FigShareDataset
+from datahugger.services import OSFDataset
+from datahugger.services import ZenodoDataset
 
 
 def test_resolve_service():
@@ -70,3 +81,123 @@ def test_get_doi_metadata_from_instance(tmpdir):
     m2 = doi.metadata.citation()
 
     assert m1 == m2 is not None
+
+
+class OfflineSession:
+    def request(self, *args, **kwargs):
+        raise AssertionError("No requests expected")
+
+    head = get = request
+
+
+@pytest.mark.parametrize(
+    "doi,service_class,record_id",
+    [
+        ("10.5281/zenodo.6625880", ZenodoDataset, "6625880"),
+        (
+            "https://doi.org/10.7910/DVN/KBHLOD",
+            DataverseDataset,
+            "doi:10.7910/DVN/KBHLOD",
+        ),
+        ("10.5061/dryad.31zcrjdm5", DataDryadDataset, "10.5061/dryad.31zcrjdm5"),
+        ("10.6084/m9.figshare.8851784.v1", FigShareDataset, "8851784"),
+        ("10.17605/OSF.IO/EWS27", OSFDataset, "ews27"),
+        ("10.17605/osf.io/ews27", OSFDataset, "ews27"),
+        ("10.48550/arXiv.2301.00001", ArXivDataset, "2301.00001"),
+    ],
+)
+def test_route_doi(doi, service_class, record_id):
+    session = OfflineSession()
+
+    handle = parse_resource_identifier(doi, session=session)
+    service = _resolve_service(handle, session=session)(handle, session=session)
+
+    assert isinstance(service, service_class)
+    assert service._params["record_id"] == record_id
+
+
+@pytest.mark.parametrize(
+    "url,service_class",
+    [
+        ("https://zenodo.org/records/6614829", ZenodoDataset),
+        ("https://www.zenodo.org/records/6614829", ZenodoDataset),
+        ("https://ZENODO.org/records/6614829", ZenodoDataset),
+        ("https://osf.io/ews27/", OSFDataset),
+        ("https://figshare.example.org/articles/dataset/name/123", FigShareDataset),
+        (
+            "https://dataverse.example.org/dataset.xhtml?persistentId=doi:10.1/X",
+            DataverseDataset,
+        ),
+    ],
+)
+def test_resolve_service_from_url(url, service_class):
+    assert _resolve_service(url) is service_class
+
+
+def test_resolve_service_from_url_subdomain():
+    # another deployment with other records, not served by the Zenodo API
+    with pytest.raises(RepositoryNotSupportedError):
+        _resolve_service("https://sandbox.zenodo.org/records/6614829")
+
+
+def test_host_matcher():
+    matcher = HostMatcher({"example.org": 1, "data.example.org": 2})
+
+    assert matcher.match("example.org") == 1
+    assert matcher.match("www.example.org") == 1
+    assert matcher.match("data.example.org") == 2
+    assert matcher.match("www.data.example.org") == 2
+    assert matcher.match("api.data.example.org") is None
+    assert matcher.match("sandbox.example.org") is None
+    assert matcher.match("example.com") is None
+    assert matcher.match("org") is None
+    assert matcher.match("notexample.org") is None
+
+
+def test_pattern_matcher_order():
+    matcher = PatternMatcher({r".*/a/(\d+)": 1, r".*/a/.*": 2, r"b(?P<id>\d)": 3})
+
+    assert matcher.match("https://example.org/a/1") == 1
+    assert matcher.match("https://example.org/a/b") == 2
+    assert matcher.match("b1") == 3
+    assert matcher.match("https://example.org/b/1") is None
+
+
+@pytest.mark.parametrize(
+    "s,cls,value",
+    [
+        ("10.5281/zenodo.6614829", DOI, "10.5281/zenodo.6614829"),
+        ("doi:10.5281/zenodo.6614829", DOI, "10.5281/zenodo.6614829"),
+        ("https://doi.org/10.5281/zenodo.6614829", DOI, "10.5281/zenodo.6614829"),
+        ("http://dx.doi.org/10.7910/DVN/C0GO0U", DOI, "10.7910/DVN/C0GO0U"),
+        (
+            "hdl:https://hdl.handle.net/10411/0",
+            Handle,
+            "https://hdl.handle.net/10411/0",
+        ),
+        ("arXiv:2101.00001v2", ArXiv, "2101.00001"),
+        ("https://arxiv.org/abs/hep-th/9901001", ArXiv, "hep-th/9901001"),
+        (
+            "https://zenodo.org/records/6614829",
+            str,
+            "https://zenodo.org/records/6614829",
+        ),
+        ("https://doi.org/10.1234/x?download=1", str, None),
+    ],
+)
+def test_parse_identifier(s, cls, value):
+    handle = parse_identifier(s)
+
+    assert isinstance(handle, cls)
+    assert str(handle) == (s if value is None else value)
+
+
+def test_parse_many():
+    handles = datahugger.parse_many(
+        ["10.5281/zenodo.6614829", "not an identifier", "https://osf.io/ews27/"]
+    )
+
+    assert isinstance(handles[0], DOI)
+    assert handles[0].url == "https://zenodo.org/records/6614829"
+    assert isinstance(handles[1], ValueError)
+    assert handles[2] == "https://osf.io/ews27/"
@@ -0,0 +1,100 @@
+import io
+import time
+
+import pytest
+import requests
+
+from datahugger.retry import Retrier
+from datahugger.retry import RetryStats
+from datahugger.retry import _parse_retry_after
+
+
+class FlakyRequest:
+    """Request that fails a number of times with a connection error."""
+
+    def __init__(self, n_failures):
+        self.n_failures = n_failures
+        self.n_calls = 0
+
+    def __call__(self):
+        self.n_calls += 1
+        if self.n_calls <= self.n_failures:
+            raise requests.ConnectionError("connection reset")
+        return "ok"
+
+
+def test_retry():
+    retrier = Retrier(backoff_factor=0.001)
+    stats = RetryStats()
+
+    assert retrier.call(FlakyRequest(2), "https://example.org/", stats=stats) == "ok"
+    assert (stats.retries, stats.failures) == (2, 0)
+    assert retrier.stats.retries == 2
+
+
+def test_retry_max_retries():
+    retrier = Retrier(max_retries=2, backoff_factor=0.001)
+    request = FlakyRequest(10)
+
+    with pytest.raises(requests.ConnectionError):
+        retrier.call(request, "https://example.org/")
+
+    assert request.n_calls == 3
+    assert retrier.stats.failures == 1
+
+
+def test_retry_budget():
+    retrier = Retrier(budget=3, backoff_factor=0.001)
+
+    with pytest.raises(requests.ConnectionError):
+        retrier.call(FlakyRequest(10), "https://example.org/")
+
+    # the budget is spent, other requests aren't retried anymore
+    request = FlakyRequest(1)
+    with pytest.raises(requests.ConnectionError):
+        retrier.call(request, "https://example.org/")
+
+    assert request.n_calls == 1
+    assert retrier.stats.retries == 3
+
+
+def test_circuit_breaker():
+    retrier = Retrier(backoff_factor=0, breaker_threshold=2, breaker_pause=0.3)
+
+    start = time.monotonic()
+    assert retrier.call(FlakyRequest(2), "https://example.org/") == "ok"
+
+    # the host is paused after the second consecutive failure
+    assert time.monotonic() - start >= 0.3
+
+
+def test_circuit_breaker_retry_after():
+    retrier = Retrier(breaker_threshold=2, breaker_pause=30)
+
+    def throttled():
+        res = requests.Response()
+        res.status_code = 429
+        res.headers["Retry-After"] = "0"
+        res.raw = io.BytesIO(b"")
+        return res
+
+    # the server tells when to retry, the host isn't paused
+    start = time.monotonic()
+    res = retrier.call(throttled, "https://example.org/")
+    assert res.status_code == 429
+    assert time.monotonic() - start < 1
+    assert retrier.stats.retries == 5
+
+
+@pytest.mark.parametrize(
+    "value,seconds",
+    [("5", 5), ("0", 0), (None, None), ("soon", None)],
+)
+def test_parse_retry_after(value, seconds):
+    assert _parse_retry_after(value) == seconds
+
+
+def test_parse_retry_after_date():
+    date = time.strftime("%a, %d %b %Y %H:%M:%S GMT", time.gmtime(time.time() + 60))
+
+    assert 55 < _parse_retry_after(date) <= 60
@@ -0,0 +1,59 @@
+import hashlib
+import json
+
+import pytest
+
+from datahugger.__main__ import main_verify
+from datahugger.base import SYNC_STATE_FILE
+from datahugger.verify import verify_checksums
+
+
+def _create_dataset(folder):
+    files = {"data.csv": b"a", "sub/data.csv": b"b", "other.txt": b"c"}
+
+    files_info = []
+    for name, content in files.items():
+        (folder / name).parent.mkdir(parents=True, exist_ok=True)
+        (folder / name).write_bytes(content)
+        files_info.append(
+            {
+                "link": None,
+                "name": name,
+                "size": len(content),
+                "hash": hashlib.sha256(content).hexdigest(),
+                "hash_type": "sha256",
+            }
+        )
+
+    # a corrupted file in a subfolder with the same name
+    (folder / "sub" / "data.csv").write_bytes(b"x")
+
+    return files_info
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_verify_checksums(tmp_path, max_workers):
+    files_info = _create_dataset(tmp_path)
+
+    checksums = verify_checksums(tmp_path, files_info, max_workers=max_workers)
+
+    assert checksums == {"data.csv": True, "sub/data.csv": False, "other.txt": True}
+
+
+def test_verify_checksums_skip(tmp_path):
+    files_info = _create_dataset(tmp_path)
+
+    checksums = verify_checksums(tmp_path, files_info, skip=["sub/data.csv"])
+
+    assert checksums == {"data.csv": True, "other.txt": True}
+
+
+def test_verify_cli(tmp_path, capsys):
+    files_info = _create_dataset(tmp_path)
+    with open(tmp_path / SYNC_STATE_FILE, "w") as f:
+        json.dump({"files": files_info, "fingerprints": {}}, f)
+
+    with pytest.raises(SystemExit):
+        main_verify([str(tmp_path)])
+
+    assert "Checksum match: False - sub/data.csv" in capsys.readouterr().out